@@ -29,6 +29,9 @@ export default class AuroraOntologyPlugin extends Plugin {
   apiClient: ApiClient = new ApiClient(DEFAULT_SETTINGS.serverUrl);
   syncService: InsightSyncService | null = null;
   private insightPanel: InsightPanelView | null = null;
+  // Incremented per query, so questions streaming in for an older query
+  // are not shown under a newer one
+  private queryGeneration = 0;
 
   async onload(): Promise<void> {
     console.log('Loading Aurora Ontology plugin');
@@ -240,6 +243,8 @@ export default class AuroraOntologyPlugin extends Plugin {
       return;
     }
 
+    const generation = ++this.queryGeneration;
+
     // Show loading state
     this.insightPanel.setLoading(true);
 
@@ -266,11 +271,24 @@ export default class AuroraOntologyPlugin extends Plugin {
         return;
       }
 
-      // Generate comparison questions
-      const questionsResult = await this.apiClient.generateQuestions({
-        current_question: body,
-        retrieved_insights: queryResult.insights,
-      });
+      // Show the Insights right away; questions appear as they stream in
+      this.insightPanel.showInsights(body, queryResult.insights);
+
+      const questionsResult = await this.apiClient.generateQuestionsStream(
+        {
+          current_question: body,
+          retrieved_insights: queryResult.insights,
+        },
+        (question) => {
+          if (generation === this.queryGeneration) {
+            this.insightPanel?.addQuestion(question);
+          }
+        }
+      );
+
+      if (generation !== this.queryGeneration) {
+        return;
+      }
 
       // Update panel with results
       this.insightPanel.updateResults(
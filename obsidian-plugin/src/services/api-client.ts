@@ -6,6 +6,11 @@ import {
   HealthResponse,
   NotePayload,
   IndexResponse,
+  BatchIndexRequest,
+  BatchIndexResponse,
+  ManifestEntry,
+  ManifestDiffRequest,
+  ManifestDiffResponse,
   DeleteResponse,
   ReindexRequest,
   ReindexResponse,
@@ -13,6 +18,7 @@ import {
   QueryResponse,
   GenerateQuestionsRequest,
   GenerateQuestionsResponse,
+  ComparisonQuestion,
   ConfigResponse,
 } from '../types/api';
 
@@ -60,6 +66,37 @@ export class ApiClient {
     });
   }
 
+  async indexInsightsBatch(request: BatchIndexRequest): Promise<BatchIndexResponse> {
+    return this.request<BatchIndexResponse>('/insights/index-batch', {
+      method: 'POST',
+      body: JSON.stringify(request),
+    });
+  }
+
+  async getManifest(prefix: string = ''): Promise<ManifestEntry[]> {
+    const query = prefix ? `?prefix=${encodeURIComponent(prefix)}` : '';
+    const response = await fetch(`${this.baseUrl}/insights/manifest${query}`);
+
+    if (!response.ok) {
+      const error = await response.text();
+      throw new Error(`API Error (${response.status}): ${error}`);
+    }
+
+    // NDJSON: one entry per line
+    const body = await response.text();
+    return body
+      .split('\n')
+      .filter((line) => line.trim())
+      .map((line) => JSON.parse(line) as ManifestEntry);
+  }
+
+  async diffInsights(request: ManifestDiffRequest): Promise<ManifestDiffResponse> {
+    return this.request<ManifestDiffResponse>('/insights/diff', {
+      method: 'POST',
+      body: JSON.stringify(request),
+    });
+  }
+
   async deleteInsight(path: string): Promise<DeleteResponse> {
     const encodedPath = encodeURIComponent(path);
     return this.request<DeleteResponse>(`/insights/${encodedPath}`, {
@@ -93,6 +130,70 @@ export class ApiClient {
     );
   }
 
+  /**
+   * Generate comparison questions over Server-Sent Events, calling
+   * onQuestion for each question as soon as the server has it.
+   * Resolves with the full response once generation is done.
+   */
+  async generateQuestionsStream(
+    request: GenerateQuestionsRequest,
+    onQuestion: (question: ComparisonQuestion) => void
+  ): Promise<GenerateQuestionsResponse> {
+    const response = await fetch(
+      `${this.baseUrl}/generate/comparison-questions/stream`,
+      {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(request),
+      }
+    );
+
+    if (!response.ok || !response.body) {
+      const error = await response.text();
+      throw new Error(`API Error (${response.status}): ${error}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        break;
+      }
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            data += line.slice(5).trim();
+          }
+        }
+
+        if (event === 'question') {
+          onQuestion(JSON.parse(data) as ComparisonQuestion);
+        } else if (event === 'done') {
+          await reader.cancel();
+          return JSON.parse(data) as GenerateQuestionsResponse;
+        } else if (event === 'error') {
+          throw new Error(`API Error: ${JSON.parse(data).detail}`);
+        }
+      }
+    }
+
+    throw new Error('Question stream ended before generation finished');
+  }
+
   async getConfig(): Promise<ConfigResponse> {
     return this.request<ConfigResponse>('/config');
   }
@@ -0,0 +1,32 @@
+/**
+ * Canonical note bodies and their fingerprints, matching the server's
+ * canonical_body and compute_content_hash so that hash-only sync offers
+ * match notes the server indexed from disk itself.
+ */
+
+/** Characters Python's str.strip() removes. */
+const PY_WHITESPACE =
+  '\\t\\n\\v\\f\\r\\x1c-\\x1f \\x85\\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000';
+const EDGE_WHITESPACE = new RegExp(`^[${PY_WHITESPACE}]+|[${PY_WHITESPACE}]+$`, 'g');
+
+/**
+ * Text with line endings normalized to \n and surrounding whitespace
+ * stripped, as the server reads note files and bodies.
+ */
+export function canonicalText(text: string): string {
+  return text.replace(/\r\n?/g, '\n').replace(EDGE_WHITESPACE, '');
+}
+
+/**
+ * SHA-256 hex digest of the UTF-8 content, matching the server's
+ * content fingerprint. Hash canonical bodies only.
+ */
+export async function hashContent(content: string): Promise<string> {
+  const digest = await crypto.subtle.digest(
+    'SHA-256',
+    new TextEncoder().encode(content)
+  );
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
@@ -5,14 +5,28 @@
 
 import { TFile, TAbstractFile, Vault, Notice, debounce } from 'obsidian';
 import { ApiClient } from './api-client';
+import { hashContent } from './content-hash';
 import { isInsightNote, parseFrontmatter } from './note-classifier';
+import { BatchIndexResult, BatchNotePayload } from '../types/api';
 
 export interface SyncStats {
   indexed: number;
+  unchanged: number;
   deleted: number;
   errors: string[];
 }
 
+/** Notes per batch request during a full sync. */
+const SYNC_BATCH_SIZE = 100;
+
+/**
+ * File modification time as ISO 8601, stored by the server to diff
+ * manifests against.
+ */
+function modifiedAt(file: TFile): string {
+  return new Date(file.stat.mtime).toISOString();
+}
+
 export class InsightSyncService {
   private vault: Vault;
   private apiClient: ApiClient;
@@ -40,6 +54,7 @@ export class InsightSyncService {
         path: file.path,
         content: body,
         frontmatter: frontmatter as Record<string, unknown>,
+        modified_at: modifiedAt(file),
       });
 
       console.log(`[InsightSync] Synced: ${file.path}`);
@@ -186,10 +201,16 @@ export class InsightSyncService {
   /**
    * Sync all Insights in the vault to the server.
    * Used for initial sync or full re-sync.
+   *
+   * The server first diffs the vault's manifest (paths and modification
+   * times) against its index. Only notes it reports as missing or out of
+   * date are read and sent, in batches, first as content hashes only;
+   * indexed notes that are no longer in the vault are deleted.
    */
   async syncAllInsights(showNotice: boolean = true): Promise<SyncStats> {
     const stats: SyncStats = {
       indexed: 0,
+      unchanged: 0,
       deleted: 0,
       errors: [],
     };
@@ -200,25 +221,108 @@ export class InsightSyncService {
 
     const insightFiles = this.vault.getFiles().filter(isInsightNote);
 
-    for (const file of insightFiles) {
+    let changedFiles: TFile[] = insightFiles;
+    try {
+      const diff = await this.apiClient.diffInsights({
+        notes: insightFiles.map((file) => ({
+          path: file.path,
+          modified_at: modifiedAt(file),
+        })),
+        prefix: 'Insights/',
+      });
+      const send = new Set(diff.send);
+      changedFiles = insightFiles.filter((file) => send.has(file.path));
+      stats.unchanged += diff.unchanged;
+
+      for (const path of diff.delete) {
+        try {
+          await this.deleteInsight(path);
+          stats.deleted++;
+        } catch (error) {
+          stats.errors.push(`${path}: ${error}`);
+        }
+      }
+    } catch (error) {
+      // Older servers without the diff endpoint: offer every note
+      console.error('[InsightSync] Manifest diff failed, syncing all notes:', error);
+    }
+
+    for (let i = 0; i < changedFiles.length; i += SYNC_BATCH_SIZE) {
+      const batch = changedFiles.slice(i, i + SYNC_BATCH_SIZE);
       try {
-        await this.syncInsight(file);
-        stats.indexed++;
+        await this.syncBatch(batch, stats);
       } catch (error) {
-        stats.errors.push(`${file.path}: ${error}`);
+        for (const file of batch) {
+          stats.errors.push(`${file.path}: ${error}`);
+        }
       }
     }
 
     if (showNotice) {
+      const synced = stats.indexed + stats.unchanged;
       if (stats.errors.length > 0) {
         new Notice(
-          `Synced ${stats.indexed} Insights. ${stats.errors.length} errors.`
+          `Synced ${synced} Insights (${stats.unchanged} unchanged). ${stats.errors.length} errors.`
         );
       } else {
-        new Notice(`Synced ${stats.indexed} Insights successfully.`);
+        new Notice(
+          `Synced ${synced} Insights successfully (${stats.unchanged} unchanged).`
+        );
       }
     }
 
     return stats;
   }
+
+  /**
+   * Sync a batch of Insights with at most two requests: one offering
+   * content hashes, one with the content the server asked for.
+   */
+  private async syncBatch(files: TFile[], stats: SyncStats): Promise<void> {
+    const notes = new Map<string, BatchNotePayload>();
+    for (const file of files) {
+      const content = await this.vault.read(file);
+      const { frontmatter, body } = parseFrontmatter(content);
+      notes.set(file.path, {
+        path: file.path,
+        content: body,
+        content_hash: await hashContent(body),
+        frontmatter: frontmatter as Record<string, unknown>,
+        modified_at: modifiedAt(file),
+      });
+    }
+
+    const offered = await this.apiClient.indexInsightsBatch({
+      notes: Array.from(notes.values(), ({ content, ...note }) => note),
+    });
+
+    const needed: BatchNotePayload[] = [];
+    for (const result of offered.results) {
+      const note = notes.get(result.path);
+      if (result.status === 'needs_content' && note) {
+        needed.push(note);
+      } else {
+        this.recordResult(result, stats);
+      }
+    }
+
+    if (needed.length === 0) {
+      return;
+    }
+
+    const sent = await this.apiClient.indexInsightsBatch({ notes: needed });
+    for (const result of sent.results) {
+      this.recordResult(result, stats);
+    }
+  }
+
+  private recordResult(result: BatchIndexResult, stats: SyncStats): void {
+    if (result.status === 'indexed') {
+      stats.indexed++;
+    } else if (result.status === 'unchanged') {
+      stats.unchanged++;
+    } else {
+      stats.errors.push(`${result.path}: ${result.error ?? result.status}`);
+    }
+  }
 }
@@ -4,6 +4,7 @@
 
 import { TFile } from 'obsidian';
 import { NoteType, NoteFrontmatter } from '../types/entities';
+import { canonicalText } from './content-hash';
 
 export function classifyNote(file: TFile): NoteType | null {
   const path = file.path;
@@ -27,21 +28,29 @@ export function isThoughtNote(file: TFile): boolean {
   return classifyNote(file) === 'thought';
 }
 
+/**
+ * Split a note into frontmatter and body the way the server does
+ * (python-frontmatter's YAML boundaries), returning the canonical body
+ * so its hash matches the server's for the same file.
+ */
 export function parseFrontmatter(content: string): {
   frontmatter: NoteFrontmatter;
   body: string;
 } {
-  const frontmatterRegex = /^---\n([\s\S]*?)\n---\n?([\s\S]*)$/;
-  const match = content.match(frontmatterRegex);
+  const text = canonicalText(content);
+  const boundary = /^-{3,}\s*$/gm;
+  const opening = boundary.exec(text);
+  const closing = opening && opening.index === 0 ? boundary.exec(text) : null;
 
-  if (!match) {
+  if (!opening || !closing) {
     return {
       frontmatter: {},
-      body: content,
+      body: text,
     };
   }
 
-  const [, frontmatterRaw, body] = match;
+  const frontmatterRaw = text.slice(opening[0].length, closing.index);
+  const body = canonicalText(text.slice(closing.index + closing[0].length));
   const frontmatter: NoteFrontmatter = {};
 
   // Simple YAML parsing for common fields
@@ -23,6 +23,52 @@ export interface IndexResponse {
   embedding_dimension: number;
 }
 
+export interface BatchNotePayload {
+  path: string;
+  content?: string;
+  content_hash?: string;
+  frontmatter: Record<string, unknown>;
+  modified_at?: string;
+}
+
+export interface BatchIndexRequest {
+  notes: BatchNotePayload[];
+}
+
+export type BatchIndexStatus = 'indexed' | 'unchanged' | 'needs_content' | 'error';
+
+export interface BatchIndexResult {
+  path: string;
+  status: BatchIndexStatus;
+  insight_id: string;
+  error?: string;
+}
+
+export interface BatchIndexResponse {
+  results: BatchIndexResult[];
+  indexed: number;
+  unchanged: number;
+  needs_content: number;
+  failed: number;
+}
+
+export interface ManifestEntry {
+  path: string;
+  content_hash?: string | null;
+  modified_at?: string | null;
+}
+
+export interface ManifestDiffRequest {
+  notes: ManifestEntry[];
+  prefix?: string;
+}
+
+export interface ManifestDiffResponse {
+  send: string[];
+  delete: string[];
+  unchanged: number;
+}
+
 export interface DeleteResponse {
   success: boolean;
   message: string;
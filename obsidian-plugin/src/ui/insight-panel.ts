@@ -14,6 +14,7 @@ export class InsightPanelView extends ItemView {
   private insights: RetrievedInsight[] = [];
   private questions: ComparisonQuestion[] = [];
   private isLoading = false;
+  private isGeneratingQuestions = false;
 
   constructor(leaf: WorkspaceLeaf, plugin: AuroraOntologyPlugin) {
     super(leaf);
@@ -54,6 +55,25 @@ export class InsightPanelView extends ItemView {
     this.insights = insights;
     this.questions = questions;
     this.isLoading = false;
+    this.isGeneratingQuestions = false;
+    this.render();
+  }
+
+  /**
+   * Show retrieved Insights while their questions are still being
+   * generated; questions are added with addQuestion as they arrive.
+   */
+  showInsights(question: string, insights: RetrievedInsight[]): void {
+    this.currentQuestion = question;
+    this.insights = insights;
+    this.questions = [];
+    this.isLoading = false;
+    this.isGeneratingQuestions = true;
+    this.render();
+  }
+
+  addQuestion(question: ComparisonQuestion): void {
+    this.questions.push(question);
     this.render();
   }
 
@@ -62,6 +82,7 @@ export class InsightPanelView extends ItemView {
     this.insights = [];
     this.questions = [];
     this.isLoading = false;
+    this.isGeneratingQuestions = false;
     this.render();
   }
 
@@ -157,7 +178,9 @@ export class InsightPanelView extends ItemView {
 
     if (this.questions.length === 0) {
       section.createEl('p', {
-        text: 'No questions generated.',
+        text: this.isGeneratingQuestions
+          ? 'Generating questions...'
+          : 'No questions generated.',
         cls: 'aurora-no-results',
       });
       return;
@@ -203,6 +226,13 @@ export class InsightPanelView extends ItemView {
         setTimeout(() => copyBtn.setText('Copy'), 1500);
       });
     }
+
+    if (this.isGeneratingQuestions) {
+      section.createEl('p', {
+        text: 'Generating more questions...',
+        cls: 'aurora-no-results',
+      });
+    }
   }
 
   private formatQuestionType(type: string): string {
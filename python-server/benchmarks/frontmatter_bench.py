@@ -0,0 +1,117 @@
+"""
+Compare the fast-path frontmatter parser with python-frontmatter.
+
+Notes are generated from the frontmatter shapes used in example-vault,
+scaled up with varied values. Run from python-server/:
+
+    python -m benchmarks.frontmatter_bench [--notes 5000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+import frontmatter
+
+from src.services.note_parser import parse_frontmatter
+
+BODY = (
+    "# {title}\n\n"
+    "Knowledge that changes how I act becomes part of me. "
+    "See [[related-note|a related note]] and [[another-note]].\n"
+)
+
+
+def insight_note(rng: random.Random, i: int) -> str:
+    questions = [f"[[question-{rng.randrange(1000)}]]" for _ in range(rng.randrange(4))]
+    if rng.random() < 0.5:
+        source_questions = "[" + ", ".join(f'"{q}"' for q in questions) + "]"
+    else:
+        source_questions = "".join(f'\n  - "{q}"' for q in questions)
+    return (
+        "---\n"
+        "type: insight\n"
+        f"created: 2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}\n"
+        f"confidence: {rng.choice(['low', 'medium', 'high'])}\n"
+        f"source_questions: {source_questions}\n"
+        "evolved_from: null\n"
+        f"tags: [{', '.join(rng.sample(['learning', 'embodiment', 'understanding', 'methodology'], 2))}]\n"
+        "---\n\n"
+        + BODY.format(title=f"Insight {i}")
+    )
+
+
+def question_note(rng: random.Random, i: int) -> str:
+    return (
+        "---\n"
+        "type: question\n"
+        "created: 2025-01-03\n"
+        f"status: {rng.choice(['open', 'answered'])}\n"
+        f'triggered_by: "[[thought-{i}]]"\n'
+        "related_insights: []\n"
+        "tags: [understanding, learning]\n"
+        "---\n\n"
+        + BODY.format(title=f"Question {i}?")
+    )
+
+
+def complex_note(rng: random.Random, i: int) -> str:
+    """Frontmatter the fast path hands to YAML (nested mapping, block text)."""
+    return (
+        "---\n"
+        "type: insight\n"
+        "created: 2025-01-03\n"
+        "meta:\n"
+        f"  score: {rng.random():.3f}\n"
+        "summary: |\n"
+        "  A multi-line\n"
+        "  summary.\n"
+        "---\n\n"
+        + BODY.format(title=f"Complex {i}")
+    )
+
+
+def frontmatter_loads(text: str):
+    post = frontmatter.loads(text)
+    return dict(post.metadata), post.content
+
+
+def bench(name: str, parse: Callable[[str], object], notes: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in notes:
+            parse(text)
+        best = min(best, time.perf_counter() - started)
+    per_note_us = 1e6 * best / len(notes)
+    print(f"  {name:<20} {best * 1000:9.1f} ms  {per_note_us:8.1f} us/note")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    shapes = {
+        "insight template": insight_note,
+        "question template": question_note,
+        "complex (fallback)": complex_note,
+    }
+
+    for shape, make in shapes.items():
+        notes = [make(rng, i) for i in range(args.notes)]
+        for text in notes[:100]:
+            assert parse_frontmatter(text) == frontmatter_loads(text), text
+
+        print(f"{shape} ({args.notes} notes)")
+        baseline = bench("python-frontmatter", frontmatter_loads, notes, args.repeat)
+        fast = bench("fast path", parse_frontmatter, notes, args.repeat)
+        print(f"  speedup              {baseline / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
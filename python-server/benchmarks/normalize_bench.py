@@ -0,0 +1,112 @@
+"""
+Micro-benchmark normalize_content on synthetic notes of 1KB to 1MB.
+
+Notes mix prose, headings, wiki links, embeds, markdown links and code
+blocks. The previous split/join + re.sub implementation is timed
+alongside for reference. Run from python-server/:
+
+    python -m benchmarks.normalize_bench [--repeat 5] [--max-us-per-kb N]
+
+With --max-us-per-kb the script exits non-zero if any size is slower
+than the budget, so it can guard against regressions.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+from src.services.note_parser import normalize_content
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+WORDS = (
+    "knowledge understanding question insight pattern practice memory "
+    "attention habit context model theory evidence"
+).split()
+
+
+def legacy_normalize(content: str) -> str:
+    """normalize_content before links, embeds, fences and headings were handled."""
+    content = " ".join(content.split())
+    content = re.sub(r"\[\[([^\]|]+)\|([^\]]+)\]\]", r"\2", content)
+    content = re.sub(r"\[\[([^\]]+)\]\]", r"\1", content)
+    return content.strip()
+
+
+def paragraph(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(30, 80)):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < 0.04:
+            words.append(f"[[{word}-note]]")
+        elif roll < 0.06:
+            words.append(f"[[{word}-note|{word}]]")
+        elif roll < 0.07:
+            words.append(f"[{word}](https://example.com/{word})")
+        else:
+            words.append(word)
+    return " ".join(words) + "."
+
+
+def synthetic_note(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    blocks: List[str] = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.15:
+            block = f"{'#' * rng.randint(1, 3)} {rng.choice(WORDS).title()}"
+        elif roll < 0.2:
+            block = "```python\nvalue = compute(x)\nprint(value)\n```"
+        elif roll < 0.25:
+            block = f"![[{rng.choice(WORDS)}.png]]\n![[{rng.choice(WORDS)}-note]]"
+        else:
+            block = paragraph(rng)
+        blocks.append(block)
+        length += len(block) + 2
+    return "\n\n".join(blocks)[:size]
+
+
+def bench(normalize: Callable[[str], str], text: str, repeat: int) -> float:
+    number = max(1, 200_000 // len(text))
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            normalize(text)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-us-per-kb", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"{'size':>9}  {'current':>12}  {'us/KB':>7}  {'legacy':>12}  {'ratio':>6}")
+    over_budget = False
+    for size in SIZES:
+        text = synthetic_note(size)
+        current = bench(normalize_content, text, args.repeat)
+        legacy = bench(legacy_normalize, text, args.repeat)
+        per_kb = 1e6 * current / (size / 1000)
+        print(
+            f"{size:>9}  {current * 1000:>9.3f} ms  {per_kb:>7.1f}  "
+            f"{legacy * 1000:>9.3f} ms  {legacy / current:>5.2f}x"
+        )
+        if args.max_us_per_kb is not None and per_kb > args.max_us_per_kb:
+            over_budget = True
+
+    if over_budget:
+        print(f"Slower than the budget of {args.max_us_per_kb} us/KB", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Compare parsing notes in a thread with parsing them in a warm process pool.
+
+Notes are written to a temporary folder using the frontmatter_bench
+templates. The pool is started and warmed up before timing, as the
+bulk indexer keeps one for its lifetime; the cold start is timed
+separately. Run from python-server/:
+
+    python -m benchmarks.parse_pool_bench [--workers N] [--repeat 3]
+
+PROCESS_POOL_MIN_FILES in note_parser should sit above the smallest
+note count at which the pool wins on the machines the server runs on.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.frontmatter_bench import insight_note, question_note
+from src.services import note_parser
+from src.services.note_parser import create_parse_pool, parse_notes_parallel
+
+COUNTS = [256, 1_000, 4_000, 16_000]
+
+
+async def parse_all(files: List[Path], pool, workers: int) -> None:
+    async for _, parsed, error in parse_notes_parallel(files, pool=pool, workers=workers):
+        assert error is None, error
+
+
+def bench(files: List[Path], pool, workers: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        asyncio.run(parse_all(files, pool, workers))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Time the pool at every size, not just above the current threshold
+    note_parser.PROCESS_POOL_MIN_FILES = 0
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as folder:
+        files = []
+        for i in range(max(COUNTS)):
+            make = insight_note if i % 2 else question_note
+            file_path = Path(folder) / f"note-{i}.md"
+            file_path.write_text(make(rng, i), encoding="utf-8")
+            files.append(file_path)
+
+        pool = create_parse_pool(args.workers)
+        try:
+            started = time.perf_counter()
+            bench(files[:args.workers * 64], pool, args.workers, 1)
+            print(f"cold pool start ({args.workers} workers): {time.perf_counter() - started:.3f} s")
+
+            print(f"{'notes':>8} {'thread':>10} {'warm pool':>10}")
+            for count in COUNTS:
+                thread = bench(files[:count], None, args.workers, args.repeat)
+                warm = bench(files[:count], pool, args.workers, args.repeat)
+                print(f"{count:>8} {thread * 1000:8.1f}ms {warm * 1000:8.1f}ms")
+        finally:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,40 @@
-from fastapi import APIRouter, HTTPException, Depends
+from collections import Counter
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from pathlib import Path
 from typing import Optional
+import json
 
 from .schemas import (
     HealthResponse,
+    StatsResponse,
     NotePayload,
     IndexResponse,
+    BatchIndexRequest,
+    BatchIndexStatus,
+    BatchIndexResult,
+    BatchIndexResponse,
+    IngestResult,
+    IngestSummary,
+    ManifestDiffRequest,
+    ManifestDiffResponse,
     DeleteResponse,
     ReindexRequest,
     ReindexResponse,
+    ReindexJobResponse,
+    ReindexJobStatus,
     QueryRequest,
     QueryResponse,
+    BatchQueryRequest,
+    BatchQueryResponse,
     GenerateQuestionsRequest,
     GenerateQuestionsResponse,
     ConfigResponse,
     ConfigUpdateRequest,
 )
 from ..config import Settings, get_settings
+from ..services.ingest import NoteIngest
+from ..services.manifest import diff_manifest
 
 router = APIRouter(prefix="/api/v1")
 
@@ -23,6 +42,8 @@ router = APIRouter(prefix="/api/v1")
 # Global state for services (will be injected from main.py)
 class ServiceState:
     chroma_store = None
+    bulk_indexer = None
+    reindex_jobs = None
     vault_watcher = None
     question_generator = None
     settings: Optional[Settings] = None
@@ -46,7 +67,7 @@ async def health_check(services: ServiceState = Depends(get_state)):
 
     if services.chroma_store:
         try:
-            indexed_insights = services.chroma_store.count()
+            indexed_insights = await services.chroma_store.count()
             chroma_connected = True
         except Exception:
             pass
@@ -66,6 +87,24 @@ async def health_check(services: ServiceState = Depends(get_state)):
     )
 
 
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(services: ServiceState = Depends(get_state)):
+    """Report cache and indexing counters."""
+    if not services.chroma_store:
+        return StatsResponse()
+
+    embedding_service = services.chroma_store.embedding_service
+    return StatsResponse(
+        embedding_cache=embedding_service.cache_stats(),
+        embedding_scheduler=embedding_service.scheduler_stats(),
+        embedding_coalescer=embedding_service.coalescer_stats(),
+        query_cache=services.chroma_store.query_cache_stats(),
+        write_queue=services.chroma_store.write_queue.stats(),
+        watcher=services.vault_watcher.stats() if services.vault_watcher else {},
+        chroma=services.chroma_store.latency_stats(),
+    )
+
+
 @router.post("/insights/index", response_model=IndexResponse)
 async def index_insight(
     payload: NotePayload,
@@ -80,16 +119,150 @@ async def index_insight(
             path=payload.path,
             content=payload.content,
             frontmatter=payload.frontmatter,
+            modified_at=payload.modified_at,
         )
         return IndexResponse(
             success=True,
             insight_id=insight_id,
-            embedding_dimension=1536,
+            embedding_dimension=services.chroma_store.embedding_service.dimension or 1536,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/insights/index-batch", response_model=BatchIndexResponse)
+async def index_insights_batch(
+    request: BatchIndexRequest,
+    services: ServiceState = Depends(get_state)
+):
+    """
+    Index many Insight notes with one embedding batch and write.
+
+    Notes sent with only a content_hash are checked against the index:
+    'unchanged' when it already holds that content, 'needs_content' when
+    the note must be sent again with its content.
+    """
+    if not services.chroma_store:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    try:
+        results = await services.chroma_store.upsert_many([
+            {
+                "path": note.path,
+                "content": note.content,
+                "content_hash": note.content_hash,
+                "frontmatter": note.frontmatter,
+                "modified_at": note.modified_at,
+            }
+            for note in request.notes
+        ])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    counts = Counter(result["status"] for result in results)
+    return BatchIndexResponse(
+        results=[
+            BatchIndexResult(
+                path=result["path"],
+                status=result["status"],
+                insight_id=result["id"],
+                error=result.get("error"),
+            )
+            for result in results
+        ],
+        indexed=counts[BatchIndexStatus.INDEXED.value],
+        unchanged=counts[BatchIndexStatus.UNCHANGED.value],
+        needs_content=counts[BatchIndexStatus.NEEDS_CONTENT.value],
+        failed=counts[BatchIndexStatus.ERROR.value],
+    )
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response sent while the request body is still being read.
+
+    StreamingResponse watches for client disconnects by reading from the
+    ASGI receive channel, which would take body chunks away from
+    request.stream(); here the body reader notices the disconnect instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+@router.post("/insights/ingest")
+async def ingest_insights(
+    request: Request,
+    services: ServiceState = Depends(get_state)
+):
+    """
+    Index Insights from an NDJSON body of note records, one per line.
+
+    Records take the shape of index-batch notes and are indexed in
+    batches while the upload is still arriving. The response streams one
+    NDJSON result per record as it completes, then a summary line.
+    """
+    if not services.chroma_store:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    ingest = NoteIngest(
+        services.chroma_store,
+        batch_size=services.bulk_indexer.batch_size if services.bulk_indexer else 64,
+        concurrency=services.bulk_indexer.concurrency if services.bulk_indexer else 2,
+    )
+
+    async def ndjson_lines():
+        async for result in ingest.run(request.stream()):
+            yield IngestResult(**result).model_dump_json() + "\n"
+        yield IngestSummary(**ingest.summary()).model_dump_json() + "\n"
+
+    return DuplexStreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/insights/manifest")
+async def get_insights_manifest(
+    prefix: str = "",
+    services: ServiceState = Depends(get_state)
+):
+    """
+    Stream path, content_hash and modified_at of every indexed Insight
+    as NDJSON, one note per line.
+    """
+    if not services.chroma_store:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    entries = services.chroma_store.manifest(prefix)
+
+    def ndjson_lines():
+        for start in range(0, len(entries), 500):
+            yield "".join(
+                json.dumps(entry, separators=(",", ":")) + "\n"
+                for entry in entries[start:start + 500]
+            )
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/insights/diff", response_model=ManifestDiffResponse)
+async def diff_insights_manifest(
+    request: ManifestDiffRequest,
+    services: ServiceState = Depends(get_state)
+):
+    """
+    Compare a client's manifest with the index and return the paths the
+    client has to send, and the indexed paths it no longer has.
+    """
+    if not services.chroma_store:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    diff = diff_manifest(
+        services.chroma_store,
+        [entry.model_dump() for entry in request.notes],
+        prefix=request.prefix,
+    )
+    return ManifestDiffResponse(**diff)
+
+
 @router.delete("/insights/{path:path}", response_model=DeleteResponse)
 async def delete_insight(
     path: str,
@@ -109,48 +282,108 @@ async def delete_insight(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _resolve_insights_vault(vault_path: str) -> Path:
+    """Resolve a vault path, requiring an Insights folder inside it."""
+    resolved = Path(vault_path).expanduser().resolve()
+    if not (resolved / "Insights").exists():
+        raise HTTPException(status_code=404, detail="Insights folder not found")
+    return resolved
+
+
+def _format_sse(event: str, data: str) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
 @router.post("/insights/reindex", response_model=ReindexResponse)
 async def reindex_insights(
     request: ReindexRequest,
     services: ServiceState = Depends(get_state)
 ):
-    """Bulk re-index all Insights in the vault."""
-    if not services.chroma_store:
+    """Bulk re-index all Insights in the vault and wait for completion."""
+    if not services.reindex_jobs:
         raise HTTPException(status_code=503, detail="ChromaDB not initialized")
 
-    try:
-        from ..services.note_parser import parse_insights_folder
-        from pathlib import Path
-
-        vault_path = Path(request.vault_path).expanduser().resolve()
-        insights_folder = vault_path / "Insights"
-
-        if not insights_folder.exists():
-            raise HTTPException(status_code=404, detail="Insights folder not found")
-
-        indexed_count = 0
-        errors = []
-
-        for note in parse_insights_folder(insights_folder, vault_path):
-            try:
-                await services.chroma_store.upsert(
-                    path=note["path"],
-                    content=note["content"],
-                    frontmatter=note["frontmatter"],
-                )
-                indexed_count += 1
-            except Exception as e:
-                errors.append(f"{note['path']}: {str(e)}")
-
-        return ReindexResponse(
-            success=True,
-            indexed_count=indexed_count,
-            errors=errors,
+    vault_path = _resolve_insights_vault(request.vault_path)
+
+    job = services.reindex_jobs.start(vault_path)
+    await job.wait()
+
+    if job.status == ReindexJobStatus.CANCELLED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Reindex job {job.id} was cancelled after {job.progress.written} notes",
         )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if job.status != ReindexJobStatus.COMPLETED:
+        raise HTTPException(status_code=500, detail=job.error or f"Reindex job {job.id} {job.status.value}")
+
+    return ReindexResponse(
+        success=True,
+        indexed_count=job.progress.written + job.progress.unchanged,
+        unchanged_count=job.progress.unchanged,
+        errors=list(job.progress.errors),
+    )
+
+
+@router.post("/reindex/jobs", response_model=ReindexJobResponse, status_code=202)
+async def start_reindex_job(
+    request: ReindexRequest,
+    services: ServiceState = Depends(get_state)
+):
+    """Start a background re-index of all Insights in the vault."""
+    if not services.reindex_jobs:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    vault_path = _resolve_insights_vault(request.vault_path)
+    job = services.reindex_jobs.start(vault_path)
+    return job.to_response()
+
+
+@router.get("/reindex/jobs/{job_id}", response_model=ReindexJobResponse)
+async def get_reindex_job(
+    job_id: str,
+    services: ServiceState = Depends(get_state)
+):
+    """Get the status and progress of a reindex job."""
+    job = services.reindex_jobs.get(job_id) if services.reindex_jobs else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+    return job.to_response()
+
+
+@router.delete("/reindex/jobs/{job_id}", response_model=ReindexJobResponse)
+async def cancel_reindex_job(
+    job_id: str,
+    services: ServiceState = Depends(get_state)
+):
+    """Cancel a running reindex job."""
+    job = services.reindex_jobs.cancel(job_id) if services.reindex_jobs else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+    await job.wait()
+    return job.to_response()
+
+
+@router.get("/reindex/jobs/{job_id}/events")
+async def stream_reindex_job(
+    job_id: str,
+    services: ServiceState = Depends(get_state)
+):
+    """Stream reindex job progress as Server-Sent Events."""
+    job = services.reindex_jobs.get(job_id) if services.reindex_jobs else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+
+    async def event_stream():
+        async for snapshot in services.reindex_jobs.events(job):
+            event = "done" if job.is_finished else "progress"
+            yield _format_sse(event, snapshot.model_dump_json())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @router.post("/query/insights", response_model=QueryResponse)
@@ -173,6 +406,28 @@ async def query_insights(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/query/insights/batch", response_model=BatchQueryResponse)
+async def query_insights_batch(
+    request: BatchQueryRequest,
+    services: ServiceState = Depends(get_state)
+):
+    """Query for related Insights of many Questions with one embedding batch and search."""
+    if not services.chroma_store:
+        raise HTTPException(status_code=503, detail="ChromaDB not initialized")
+
+    try:
+        results = await services.chroma_store.query_many(
+            query_texts=request.questions,
+            top_k=request.top_k,
+            min_similarity=request.min_similarity,
+        )
+        return BatchQueryResponse(
+            results=[QueryResponse(insights=insights) for insights in results]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/generate/comparison-questions", response_model=GenerateQuestionsResponse)
 async def generate_comparison_questions(
     request: GenerateQuestionsRequest,
@@ -192,6 +447,39 @@ async def generate_comparison_questions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate/comparison-questions/stream")
+async def stream_comparison_questions(
+    request: GenerateQuestionsRequest,
+    services: ServiceState = Depends(get_state)
+):
+    """
+    Generate comparison questions, streamed as Server-Sent Events.
+
+    Emits a 'question' event per ComparisonQuestion as soon as the model
+    has written it, then a 'done' event with the full response including
+    token usage, or an 'error' event if generation fails.
+    """
+    if not services.question_generator:
+        raise HTTPException(status_code=503, detail="Question generator not initialized")
+
+    async def event_stream():
+        try:
+            async for item in services.question_generator.generate_stream(
+                current_question=request.current_question,
+                retrieved_insights=request.retrieved_insights,
+            ):
+                event = "done" if isinstance(item, GenerateQuestionsResponse) else "question"
+                yield _format_sse(event, item.model_dump_json())
+        except Exception as e:
+            yield _format_sse("error", json.dumps({"detail": str(e)}))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/config", response_model=ConfigResponse)
 async def get_config(services: ServiceState = Depends(get_state)):
     """Get server configuration."""
@@ -13,6 +13,23 @@ class HealthResponse(BaseModel):
     watching: bool = False
 
 
+class StatsResponse(BaseModel):
+    """Server performance counters."""
+    embedding_cache: Dict[str, int] = Field(default_factory=dict)
+    embedding_scheduler: Dict[str, float] = Field(default_factory=dict)
+    embedding_coalescer: Dict[str, int] = Field(default_factory=dict)
+    query_cache: Dict[str, int] = Field(default_factory=dict)
+    write_queue: Dict[str, int] = Field(default_factory=dict)
+    watcher: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Vault watcher event and indexing queue counters",
+    )
+    chroma: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="Latency per ChromaDB operation",
+    )
+
+
 class NotePayload(BaseModel):
     """Payload for indexing a note."""
     path: str = Field(..., description="Relative path to note from vault root")
@@ -28,6 +45,90 @@ class IndexResponse(BaseModel):
     embedding_dimension: int = 1536
 
 
+class BatchNotePayload(BaseModel):
+    """A note in a batch index request."""
+    path: str = Field(..., description="Relative path to note from vault root")
+    content: Optional[str] = Field(
+        default=None,
+        description="Full markdown content; may be left out when content_hash is given",
+    )
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="SHA-256 hex of the UTF-8 content, to skip notes the server already has",
+    )
+    frontmatter: Dict[str, Any] = Field(default_factory=dict, description="Parsed frontmatter")
+    modified_at: Optional[str] = Field(default=None, description="ISO 8601 timestamp")
+
+
+class BatchIndexRequest(BaseModel):
+    """Request for indexing many Insights at once."""
+    notes: List[BatchNotePayload] = Field(..., max_length=500)
+
+
+class BatchIndexStatus(str, Enum):
+    """Outcome of one note in a batch index request."""
+    INDEXED = "indexed"
+    UNCHANGED = "unchanged"
+    NEEDS_CONTENT = "needs_content"
+    ERROR = "error"
+
+
+class BatchIndexResult(BaseModel):
+    """Result for one note of a batch index request."""
+    path: str
+    status: BatchIndexStatus
+    insight_id: str
+    error: Optional[str] = None
+
+
+class BatchIndexResponse(BaseModel):
+    """Response after indexing a batch of Insights."""
+    results: List[BatchIndexResult]
+    indexed: int = 0
+    unchanged: int = 0
+    needs_content: int = 0
+    failed: int = 0
+
+
+class IngestResult(BatchIndexResult):
+    """Result for one record of a streaming NDJSON ingest."""
+    line: int = Field(..., description="Line number of the record in the request body")
+
+
+class IngestSummary(BaseModel):
+    """Last line of a streaming NDJSON ingest response."""
+    done: bool = True
+    records: int = 0
+    indexed: int = 0
+    unchanged: int = 0
+    needs_content: int = 0
+    failed: int = 0
+    error: Optional[str] = Field(default=None, description="Why reading stopped early, if it did")
+
+
+class ManifestEntry(BaseModel):
+    """Version of one note, as held by the index or by a client."""
+    path: str = Field(..., description="Relative path to note from vault root")
+    content_hash: Optional[str] = Field(default=None, description="SHA-256 hex of the UTF-8 content")
+    modified_at: Optional[str] = Field(default=None, description="ISO 8601 timestamp")
+
+
+class ManifestDiffRequest(BaseModel):
+    """A client's manifest of the notes it has."""
+    notes: List[ManifestEntry]
+    prefix: str = Field(
+        default="",
+        description="Only indexed paths under this prefix are considered for deletion",
+    )
+
+
+class ManifestDiffResponse(BaseModel):
+    """Notes the client has to send or delete to bring the index up to date."""
+    send: List[str] = Field(default_factory=list)
+    delete: List[str] = Field(default_factory=list)
+    unchanged: int = 0
+
+
 class DeleteResponse(BaseModel):
     """Response after deleting an Insight."""
     success: bool
@@ -43,7 +144,41 @@ class ReindexResponse(BaseModel):
     """Response after bulk re-indexing."""
     success: bool
     indexed_count: int
+    unchanged_count: int = 0
+    errors: List[str] = Field(default_factory=list)
+
+
+class ReindexJobStatus(str, Enum):
+    """Lifecycle states of a background reindex job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class ReindexProgress(BaseModel):
+    """Progress counters of a reindex job."""
+    total_files: int = 0
+    parsed: int = 0
+    embedded: int = 0
+    written: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    throughput: float = Field(default=0.0, description="Notes processed per second")
+
+
+class ReindexJobResponse(BaseModel):
+    """State of a background reindex job."""
+    job_id: str
+    vault_path: str
+    status: ReindexJobStatus
+    progress: ReindexProgress
     errors: List[str] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: str
+    finished_at: Optional[str] = None
 
 
 class QueryRequest(BaseModel):
@@ -66,6 +201,23 @@ class QueryResponse(BaseModel):
     insights: List[RetrievedInsight]
 
 
+class BatchQueryRequest(BaseModel):
+    """Request for querying related Insights of many Questions."""
+    questions: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Full text of each Question note",
+    )
+    top_k: int = Field(default=5, ge=1, le=10, description="Number of results per Question")
+    min_similarity: float = Field(default=0.7, ge=0.0, le=1.0, description="Minimum similarity threshold")
+
+
+class BatchQueryResponse(BaseModel):
+    """Retrieved Insights per Question, in request order."""
+    results: List[QueryResponse]
+
+
 class QuestionType(str, Enum):
     """Types of comparison questions."""
     MEMORY_INVOKE = "memory_invoke"
@@ -8,7 +8,10 @@ class Settings(BaseSettings):
     """Application configuration settings."""
 
     # OpenAI Configuration
-    openai_api_key: str = Field(..., description="OpenAI API Key")
+    openai_api_key: Optional[str] = Field(
+        default=None,
+        description="OpenAI API Key (optional with a local embedding model)"
+    )
 
     # Server Configuration
     host: str = Field(default="127.0.0.1", description="Server host")
@@ -16,17 +19,115 @@ class Settings(BaseSettings):
 
     # Vault Configuration
     vault_path: Optional[str] = Field(default=None, description="Path to Obsidian vault")
+    reconcile_on_start: bool = Field(
+        default=True,
+        description="Index notes changed while the server was down when watching starts"
+    )
+    watch_quiet_ms: float = Field(
+        default=300.0,
+        description="Quiet period after the last file change before indexing a batch"
+    )
+    watch_max_latency_ms: float = Field(
+        default=2000.0,
+        description="Longest a file change waits for indexing during continuous activity"
+    )
+    watch_workers: int = Field(
+        default=2,
+        description="Workers indexing changed files from the watcher queue"
+    )
+    watch_queue_size: int = Field(
+        default=1000,
+        description="Changed files waiting for indexing before the watcher applies backpressure"
+    )
 
     # ChromaDB Configuration
     chroma_persist_dir: str = Field(
         default="./chroma_data",
         description="Directory to persist ChromaDB data"
     )
+    chroma_workers: int = Field(
+        default=4,
+        description="Threads running blocking ChromaDB calls"
+    )
+    write_batch_size: int = Field(
+        default=256,
+        description="Queued note writes that trigger an immediate flush"
+    )
+    write_flush_ms: float = Field(
+        default=50.0,
+        description="Maximum time a queued write waits before being flushed"
+    )
 
     # Embedding Configuration
     embedding_model: str = Field(
         default="text-embedding-3-small",
-        description="OpenAI embedding model to use"
+        description="Embedding model: an OpenAI model, or 'local:<sentence-transformers model>'"
+    )
+    local_embedding_workers: int = Field(
+        default=1,
+        description="Worker processes for a local embedding model"
+    )
+    embedding_batch_size: int = Field(
+        default=256,
+        description="Maximum inputs per embedding API request"
+    )
+    embedding_batch_tokens: int = Field(
+        default=200000,
+        description="Maximum total tokens per embedding API request"
+    )
+    embedding_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent embedding API requests"
+    )
+    embedding_requests_per_minute: int = Field(
+        default=3000,
+        description="Embedding API request budget per minute"
+    )
+    embedding_tokens_per_minute: int = Field(
+        default=1000000,
+        description="Embedding API token budget per minute"
+    )
+    embedding_max_retries: int = Field(
+        default=5,
+        description="Retries for rate-limited or failed embedding requests"
+    )
+    embedding_coalesce_ms: float = Field(
+        default=5.0,
+        description="Window for coalescing concurrent query embeddings (0 disables waiting)"
+    )
+    embedding_cache_size: int = Field(
+        default=50000,
+        description="Maximum number of cached embeddings (0 disables the cache)"
+    )
+
+    # Chunking Configuration
+    chunk_tokens: int = Field(
+        default=1000,
+        description="Maximum tokens per indexed chunk of a long Insight; capped at the embedding model's input limit"
+    )
+    chunk_overlap_tokens: int = Field(
+        default=100,
+        description="Tokens repeated between consecutive chunks"
+    )
+
+    # Query Configuration
+    query_cache_size: int = Field(
+        default=256,
+        description="Maximum number of cached query results (0 disables the cache)"
+    )
+
+    # Bulk Indexing Configuration
+    index_batch_size: int = Field(
+        default=64,
+        description="Maximum notes per embedding batch during bulk indexing"
+    )
+    index_concurrency: int = Field(
+        default=4,
+        description="Maximum embedding batches in flight during bulk indexing"
+    )
+    index_parse_workers: Optional[int] = Field(
+        default=None,
+        description="Processes parsing notes during bulk indexing (default: CPU count)"
     )
 
     # LLM Configuration
@@ -26,25 +26,59 @@ async def lifespan(app: FastAPI):
     # Initialize ChromaDB
     try:
         from .services.chroma_store import ChromaStore
+        from .services.rate_limiter import RateLimiter
         state.chroma_store = ChromaStore(
             persist_dir=str(settings.chroma_persist_dir_resolved),
             openai_api_key=settings.openai_api_key,
             embedding_model=settings.embedding_model,
+            embedding_cache_size=settings.embedding_cache_size,
+            embedding_batch_size=settings.embedding_batch_size,
+            embedding_batch_tokens=settings.embedding_batch_tokens,
+            embedding_concurrency=settings.embedding_concurrency,
+            rate_limiter=RateLimiter(
+                requests_per_minute=settings.embedding_requests_per_minute,
+                tokens_per_minute=settings.embedding_tokens_per_minute,
+                max_retries=settings.embedding_max_retries,
+            ),
+            embedding_coalesce_window=settings.embedding_coalesce_ms / 1000.0,
+            query_cache_size=settings.query_cache_size,
+            chunk_tokens=settings.chunk_tokens,
+            chunk_overlap_tokens=settings.chunk_overlap_tokens,
+            local_embedding_workers=settings.local_embedding_workers,
+            chroma_workers=settings.chroma_workers,
+            write_batch_size=settings.write_batch_size,
+            write_flush_interval=settings.write_flush_ms / 1000.0,
         )
         logger.info(f"ChromaDB initialized at {settings.chroma_persist_dir_resolved}")
     except Exception as e:
         logger.error(f"Failed to initialize ChromaDB: {e}")
 
-    # Initialize Question Generator
-    try:
-        from .services.question_generator import QuestionGenerator
-        state.question_generator = QuestionGenerator(
-            openai_api_key=settings.openai_api_key,
-            model=settings.llm_model,
+    # Initialize Bulk Indexer
+    if state.chroma_store:
+        from .services.bulk_indexer import BulkIndexer
+        state.bulk_indexer = BulkIndexer(
+            chroma_store=state.chroma_store,
+            batch_size=settings.index_batch_size,
+            concurrency=settings.index_concurrency,
+            parse_workers=settings.index_parse_workers,
         )
-        logger.info("Question Generator initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize Question Generator: {e}")
+
+        from .services.reindex_jobs import ReindexJobManager
+        state.reindex_jobs = ReindexJobManager(bulk_indexer=state.bulk_indexer)
+
+    # Initialize Question Generator
+    if settings.openai_api_key:
+        try:
+            from .services.question_generator import QuestionGenerator
+            state.question_generator = QuestionGenerator(
+                openai_api_key=settings.openai_api_key,
+                model=settings.llm_model,
+            )
+            logger.info("Question Generator initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize Question Generator: {e}")
+    else:
+        logger.warning("OPENAI_API_KEY not set, question generation disabled")
 
     # Initialize Vault Watcher if vault path is set
     if settings.vault_path:
@@ -53,6 +87,12 @@ async def lifespan(app: FastAPI):
             state.vault_watcher = VaultWatcher(
                 vault_path=str(settings.vault_path_resolved),
                 chroma_store=state.chroma_store,
+                bulk_indexer=state.bulk_indexer,
+                reconcile_on_start=settings.reconcile_on_start,
+                quiet_period=settings.watch_quiet_ms / 1000.0,
+                max_latency=settings.watch_max_latency_ms / 1000.0,
+                workers=settings.watch_workers,
+                max_queued=settings.watch_queue_size,
             )
             await state.vault_watcher.start()
             logger.info(f"Vault Watcher started for {settings.vault_path}")
@@ -70,6 +110,16 @@ async def lifespan(app: FastAPI):
         await state.vault_watcher.stop()
         logger.info("Vault Watcher stopped")
 
+    if state.reindex_jobs:
+        await state.reindex_jobs.shutdown()
+
+    if state.bulk_indexer:
+        state.bulk_indexer.close()
+
+    if state.chroma_store:
+        await state.chroma_store.flush()
+        state.chroma_store.close()
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
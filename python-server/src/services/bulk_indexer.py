@@ -0,0 +1,233 @@
+"""Batched, concurrent bulk indexing of the Insights folder."""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Any, List, AsyncIterator, Optional
+import logging
+import os
+import time
+
+from .chroma_store import ChromaStore
+from .note_parser import (
+    PROCESS_POOL_MIN_FILES,
+    create_parse_pool,
+    get_relative_path,
+    parse_notes_parallel,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IndexProgress:
+    """Live counters for a bulk indexing run."""
+
+    def __init__(self):
+        self.total_files = 0
+        self.parsed = 0
+        self.embedded = 0
+        self.written = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Notes processed per second."""
+        elapsed = self.elapsed_seconds
+        done = self.written + self.unchanged + self.failed
+        return done / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_files": self.total_files,
+            "parsed": self.parsed,
+            "embedded": self.embedded,
+            "written": self.written,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput": round(self.throughput, 2),
+        }
+
+
+class BulkIndexer:
+    """
+    Index many Insights at once.
+
+    Files are parsed in a thread, or for large sets in a process pool that
+    lives until close(), and grouped into batches; each batch is embedded
+    with one embed_batch call (which splits it further by token budget)
+    and written with one Chroma upsert. A bounded number of batches are
+    in flight at a time.
+    """
+
+    def __init__(
+        self,
+        chroma_store: ChromaStore,
+        batch_size: int = 64,
+        concurrency: int = 4,
+        parse_workers: Optional[int] = None,
+    ):
+        self.chroma_store = chroma_store
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_parse_pool(self, file_count: int) -> Optional[ProcessPoolExecutor]:
+        """The long-lived parse pool, started on the first set large enough to use it."""
+        if self.parse_workers < 2 or file_count < PROCESS_POOL_MIN_FILES:
+            return None
+        if self._parse_pool is None:
+            self._parse_pool = create_parse_pool(self.parse_workers)
+        return self._parse_pool
+
+    def close(self):
+        """Shut down the parse pool."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
+    async def _parse_files(
+        self,
+        files: List[Path],
+        vault_path: Path,
+        progress: IndexProgress,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse files, in the process pool for large sets, yielding notes in order."""
+        pool = self._get_parse_pool(len(files))
+        try:
+            async for file_path, parsed, error in parse_notes_parallel(
+                files, pool=pool, workers=self.parse_workers
+            ):
+                relative_path = get_relative_path(file_path, vault_path)
+                if error is not None:
+                    progress.failed += 1
+                    progress.errors.append(f"{relative_path}: {error}")
+                    continue
+
+                progress.parsed += 1
+                yield {
+                    "path": relative_path,
+                    "content": parsed["content"],
+                    "frontmatter": parsed["frontmatter"],
+                    "mtime": parsed["mtime"],
+                    "size": parsed["size"],
+                }
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next run
+            if self._parse_pool is pool:
+                self.close()
+            raise
+
+    async def index_folder(
+        self,
+        insights_folder: Path,
+        vault_path: Path,
+        progress: Optional[IndexProgress] = None,
+    ) -> Dict[str, Any]:
+        """
+        Index every Insight under insights_folder.
+
+        Args:
+            insights_folder: Folder to scan recursively for notes
+            vault_path: Vault root, used to build relative paths
+            progress: Optional counters updated while the run progresses
+
+        Returns:
+            Dict with 'indexed_count', 'unchanged_count' and 'errors' keys
+        """
+        # Walking a large vault blocks, so keep it off the event loop
+        files = await asyncio.to_thread(lambda: sorted(insights_folder.rglob("*.md")))
+        return await self.index_files(files, vault_path, progress)
+
+    async def index_files(
+        self,
+        files: List[Path],
+        vault_path: Path,
+        progress: Optional[IndexProgress] = None,
+    ) -> Dict[str, Any]:
+        """
+        Index the given note files.
+
+        Args:
+            files: Note files to parse and index
+            vault_path: Vault root, used to build relative paths
+            progress: Optional counters updated while the run progresses
+
+        Returns:
+            Dict with 'indexed_count', 'unchanged_count' and 'errors' keys
+        """
+        if progress is None:
+            progress = IndexProgress()
+
+        progress.total_files = len(files)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+
+        def embedded(count: int):
+            progress.embedded += count
+
+        async def index_batch(batch: List[Dict[str, Any]]):
+            try:
+                results = await self.chroma_store.upsert_many(batch, on_embedded=embedded)
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} Insights failed: {e}")
+                progress.failed += len(batch)
+                progress.errors.extend(
+                    f"{note['path']}: {str(e)}" for note in batch
+                )
+                return
+            finally:
+                semaphore.release()
+
+            for result in results:
+                if result["status"] == "indexed":
+                    progress.written += 1
+                elif result["status"] == "unchanged":
+                    progress.unchanged += 1
+                elif result["status"] == "error":
+                    progress.failed += 1
+                    progress.errors.append(f"{result['path']}: {result['error']}")
+
+        async def dispatch(batch: List[Dict[str, Any]]):
+            # Wait for a free slot so parsing cannot run far ahead of writes
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(index_batch(batch)))
+
+        batch: List[Dict[str, Any]] = []
+
+        try:
+            async for note in self._parse_files(files, vault_path, progress):
+                batch.append(note)
+                if len(batch) >= self.batch_size:
+                    await dispatch(batch)
+                    batch = []
+
+            if batch:
+                await dispatch(batch)
+
+            await asyncio.gather(*tasks)
+        finally:
+            # Cancelled runs must not leave batches writing in the background
+            for task in tasks:
+                task.cancel()
+
+        logger.info(
+            f"Bulk indexed {len(files)} files: "
+            f"{progress.written} indexed, "
+            f"{progress.unchanged} unchanged, "
+            f"{len(progress.errors)} errors"
+        )
+        return {
+            "indexed_count": progress.written,
+            "unchanged_count": progress.unchanged,
+            "errors": list(progress.errors),
+        }
@@ -2,17 +2,46 @@
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple, TypeVar
+import asyncio
+import functools
 import logging
 import hashlib
+import time
 
+from .chunker import CHUNKER_VERSION, chunk_note
 from .embedding import EmbeddingService
-from .note_parser import normalize_content
+from .embedding_backends import create_embedding_backend
+from .embedding_cache import EmbeddingCache
+from .metrics import LatencyStats
+from .rate_limiter import RateLimiter
+from .write_queue import WriteOp, WriteQueue
+from .note_parser import (
+    NORMALIZE_VERSION,
+    canonical_body,
+    compute_content_hash,
+    normalize_content,
+)
 from ..api.schemas import RetrievedInsight
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 COLLECTION_NAME = "personal_ontology_insights"
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite3"
+
+# Metadata describing the file rather than the note; a change in these
+# alone is a metadata update, not a re-embed
+FILE_STAT_KEYS = ("mtime", "size", "modified_at")
+
+# Chunk candidates fetched per requested result, so that several chunks
+# of one note do not crowd other notes out of the top_k
+CHUNK_OVERSAMPLE = 4
 
 
 class ChromaStore:
@@ -21,13 +50,78 @@ class ChromaStore:
     def __init__(
         self,
         persist_dir: str,
-        openai_api_key: str,
+        openai_api_key: Optional[str],
         embedding_model: str = "text-embedding-3-small",
+        embedding_cache_size: int = 50000,
+        embedding_batch_size: int = 256,
+        embedding_batch_tokens: int = 200000,
+        embedding_concurrency: int = 4,
+        rate_limiter: Optional[RateLimiter] = None,
+        embedding_coalesce_window: float = 0.005,
+        query_cache_size: int = 256,
+        chunk_tokens: int = 1000,
+        chunk_overlap_tokens: int = 100,
+        local_embedding_workers: int = 1,
+        chroma_workers: int = 4,
+        write_batch_size: int = 256,
+        write_flush_interval: float = 0.05,
     ):
         self.persist_dir = persist_dir
-        self.embedding_service = EmbeddingService(
-            api_key=openai_api_key,
+
+        # chromadb is synchronous; run its calls off the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=chroma_workers,
+            thread_name_prefix="chroma",
+        )
+        self._latency: Dict[str, LatencyStats] = {}
+
+        # All index writes go through one queue, applied in batches
+        self.write_queue = WriteQueue(
+            apply_batch=self._apply_writes,
+            max_batch=write_batch_size,
+            flush_interval=write_flush_interval,
+        )
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.embedding_model = embedding_model
+        # Stored with every record; records built differently are
+        # treated as changed and re-embedded
+        self.index_version = (
+            f"n{NORMALIZE_VERSION}.c{CHUNKER_VERSION}"
+            f".{chunk_tokens}/{chunk_overlap_tokens}"
+        )
+        self._chunk_budget: Optional[Tuple[int, int]] = None
+
+        # Query results keyed on (normalized text, top_k, min_similarity),
+        # valid only for the index generation they were computed at
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[Tuple[str, int, float], Tuple[int, List[RetrievedInsight]]]" = OrderedDict()
+        self._generation = 0
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
+
+        # Cache embeddings next to the collection so they survive restarts
+        cache = None
+        if embedding_cache_size > 0:
+            cache = EmbeddingCache(
+                db_path=str(Path(persist_dir) / EMBEDDING_CACHE_FILE),
+                max_entries=embedding_cache_size,
+            )
+
+        backend = create_embedding_backend(
             model=embedding_model,
+            openai_api_key=openai_api_key,
+            max_batch_size=embedding_batch_size,
+            max_batch_tokens=embedding_batch_tokens,
+            max_concurrency=embedding_concurrency,
+            rate_limiter=rate_limiter,
+            local_workers=local_embedding_workers,
+        )
+        self.embedding_service = EmbeddingService(
+            backend=backend,
+            cache=cache,
+            max_batch_size=embedding_batch_size,
+            coalesce_window=embedding_coalesce_window,
         )
 
         # Initialize ChromaDB with persistence
@@ -38,72 +132,511 @@ class ChromaStore:
             ),
         )
 
+        # Records per Chroma call; a write batch of long notes can exceed it
+        self._max_chroma_batch = self.client.get_max_batch_size()
+
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=COLLECTION_NAME,
             metadata={"hnsw:space": "cosine"},
         )
 
+        # Stored metadata of each note's first chunk by path, mirroring
+        # the collection so existence and fingerprint checks skip Chroma
+        self._notes: Dict[str, Dict[str, Any]] = self._load_note_index()
+        if self._built_with_other_model():
+            logger.warning(
+                f"Index was built with another embedding model, clearing it "
+                f"to re-embed with {embedding_model}"
+            )
+            self.client.delete_collection(COLLECTION_NAME)
+            self.collection = self.client.get_or_create_collection(
+                name=COLLECTION_NAME,
+                metadata={"hnsw:space": "cosine"},
+            )
+            self._notes = {}
+
         logger.info(
             f"ChromaDB collection '{COLLECTION_NAME}' initialized "
-            f"with {self.collection.count()} documents"
+            f"with {len(self._notes)} Insights"
         )
 
     def _generate_id(self, path: str) -> str:
         """Generate a stable ID from path."""
         return hashlib.sha256(path.encode()).hexdigest()[:16]
 
-    def count(self) -> int:
+    @staticmethod
+    def _chunk_ids(doc_id: str, chunk_count: int) -> List[str]:
+        """IDs of a note's chunk records; the first chunk keeps the note ID."""
+        return [doc_id] + [f"{doc_id}-{i}" for i in range(1, chunk_count)]
+
+    async def _run(self, op: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking Chroma call in the thread pool, recording its latency."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            self._latency.setdefault(op, LatencyStats()).record(
+                time.perf_counter() - started
+            )
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return latency summaries per Chroma operation."""
+        return {op: stats.as_dict() for op, stats in self._latency.items()}
+
+    def _load_note_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read every note's first-chunk metadata from the collection."""
+        records = self.collection.get(include=["metadatas"])
+        return {
+            metadata["path"]: metadata
+            for metadata in records["metadatas"]
+            if metadata and metadata.get("path") and not metadata.get("chunk_index")
+        }
+
+    def _built_with_other_model(self) -> bool:
+        """Check whether stored vectors come from a model other than the current one."""
+        models = {stored.get("embedding_model") for stored in self._notes.values()}
+        if models - {self.embedding_model, None}:
+            return True
+        if None not in models:
+            return False
+
+        # Records from before the model was stored: compare dimensions
+        dimension = self.embedding_service.dimension
+        if dimension is None:
+            return False
+        sample = self.collection.get(limit=1, include=["embeddings"])
+        return any(len(embedding) != dimension for embedding in sample["embeddings"])
+
+    def indexed_paths(self) -> List[str]:
+        """Return the paths of all indexed Insights."""
+        return list(self._notes)
+
+    def manifest(self, prefix: str = "") -> List[Dict[str, Any]]:
+        """
+        Return path, content_hash and modified_at of every indexed note
+        under prefix, sorted by path. Notes indexed from disk without a
+        client timestamp report their file mtime as modified_at.
+        """
+        entries = []
+        for path in sorted(self._notes):
+            if not path.startswith(prefix):
+                continue
+            stored = self._notes[path]
+            modified_at = stored.get("modified_at") or None
+            if modified_at is None and stored.get("mtime"):
+                modified_at = datetime.fromtimestamp(stored["mtime"], tz=timezone.utc).isoformat()
+            entries.append({
+                "path": path,
+                "content_hash": stored.get("content_hash", ""),
+                "modified_at": modified_at,
+            })
+        return entries
+
+    def is_indexed(self, path: str) -> bool:
+        """Check whether path is in the index."""
+        return path in self._notes
+
+    def is_stale(self, path: str) -> bool:
+        """
+        Check whether path is indexed by another embedding model or index
+        version, and has to be re-embedded even if its content is unchanged.
+        """
+        stored = self._notes.get(path)
+        return stored is not None and (
+            stored.get("embedding_model") != self.embedding_model
+            or stored.get("index_version") != self.index_version
+        )
+
+    def is_current(self, path: str, mtime: float, size: int) -> bool:
+        """Check whether path is indexed, up to date, with the given file mtime and size."""
+        stored = self._notes.get(path)
+        return (
+            stored is not None
+            and self._same_file_stats(stored, mtime, size)
+            and not self.is_stale(path)
+        )
+
+    async def count(self) -> int:
         """Return the number of indexed Insights."""
-        return self.collection.count()
+        return len(self._notes)
+
+    def _bump_generation(self):
+        """Mark the index as changed, invalidating cached query results."""
+        self._generation += 1
+
+    def query_cache_stats(self) -> Dict[str, int]:
+        """Return query result cache counters."""
+        return {
+            "entries": len(self._query_cache),
+            "max_entries": self.query_cache_size,
+            "hits": self._query_cache_hits,
+            "misses": self._query_cache_misses,
+            "generation": self._generation,
+        }
+
+    def _build_metadata(
+        self,
+        path: str,
+        content_hash: str,
+        frontmatter: Dict[str, Any],
+        mtime: Optional[float],
+        size: Optional[int] = None,
+        modified_at: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build Chroma metadata, including the content fingerprint."""
+        # ChromaDB only supports primitive types
+        return {
+            "path": path,
+            "type": frontmatter.get("type", "insight"),
+            "confidence": frontmatter.get("confidence", ""),
+            "created": str(frontmatter.get("created", "")),
+            "content_hash": content_hash,
+            "mtime": float(mtime or 0.0),
+            "size": int(size or 0),
+            "modified_at": modified_at or "",
+            "embedding_model": self.embedding_model,
+            "index_version": self.index_version,
+        }
+
+    @staticmethod
+    def _same_file_stats(stored: Dict[str, Any], mtime: float, size: int) -> bool:
+        """Compare file stats, tolerating float round-off in Chroma's storage."""
+        return (
+            abs(float(stored.get("mtime") or 0.0) - mtime) < 1e-3
+            and stored.get("size") == size
+        )
+
+    @staticmethod
+    def _is_unchanged(stored: Dict[str, Any], metadata: Dict[str, Any]) -> bool:
+        """Check whether a stored record already matches the new metadata."""
+        return all(
+            stored.get(key) == value
+            for key, value in metadata.items()
+            if key not in FILE_STAT_KEYS
+        )
+
+    def _touched_metadata(
+        self,
+        stored: Dict[str, Any],
+        note: Dict[str, Any],
+        metadata: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stored metadata updated with the file stats the note brings, or
+        None when they are already current. Stats the note leaves out
+        keep their stored values.
+        """
+        changed: Dict[str, Any] = {}
+        mtime_changed = note.get("mtime") is not None and not self._same_file_stats(
+            stored, metadata["mtime"], metadata["size"]
+        )
+        if mtime_changed:
+            changed.update(mtime=metadata["mtime"], size=metadata["size"])
+        if note.get("modified_at") is not None and stored.get("modified_at") != metadata["modified_at"]:
+            changed["modified_at"] = metadata["modified_at"]
+        return {**stored, **changed} if changed else None
 
     async def upsert(
         self,
         path: str,
         content: str,
         frontmatter: Dict[str, Any],
+        mtime: Optional[float] = None,
+        size: Optional[int] = None,
+        modified_at: Optional[str] = None,
     ) -> str:
         """
         Index or update an Insight.
 
+        Unchanged notes (same content hash and metadata, embedded by the
+        current model and index version) are skipped without an embedding
+        call or vector write.
+
         Args:
             path: Relative path from vault root
             content: Markdown content (without frontmatter)
             frontmatter: Parsed frontmatter metadata
+            mtime: File modification time, if known
+            size: File size in bytes, if known
+            modified_at: Client-reported modification time (ISO 8601), if known
 
         Returns:
             The document ID
         """
-        doc_id = self._generate_id(path)
+        results = await self.upsert_many([{
+            "path": path,
+            "content": content,
+            "frontmatter": frontmatter,
+            "mtime": mtime,
+            "size": size,
+            "modified_at": modified_at,
+        }])
+        result = results[0]
+        if result["status"] == "error":
+            raise ValueError(result["error"])
+        return result["id"]
 
-        # Normalize content for embedding
-        normalized = normalize_content(content)
+    async def _get_chunk_budget(self) -> Tuple[int, int]:
+        """Chunk size and overlap, capped by what the model reads of an input."""
+        if self._chunk_budget is None:
+            max_tokens = self.chunk_tokens
+            limit = await self.embedding_service.max_input_tokens()
+            if limit is not None and limit < max_tokens:
+                logger.info(f"Chunking at {limit} tokens, the embedding model's input limit")
+                max_tokens = limit
+            self._chunk_budget = (
+                max_tokens, min(self.chunk_overlap_tokens, max_tokens // 4)
+            )
+        return self._chunk_budget
 
-        if not normalized.strip():
-            logger.warning(f"Empty content for {path}, skipping")
-            raise ValueError("Cannot index empty content")
+    def _prepare_chunks(
+        self,
+        contents: List[str],
+        max_tokens: int,
+        overlap_tokens: int,
+    ) -> List[Tuple[List[Tuple[str, str]], Optional[List[List[int]]]]]:
+        """
+        Split notes into (chunk, normalized) pairs, dropping chunks that
+        normalize to nothing, and tokenize the normalized chunks for the
+        embedding backend. Blocking; run in a worker thread.
 
-        # Generate embedding
-        embedding = await self.embedding_service.embed(normalized)
+        Returns:
+            Per note, its chunks and their token lists (None when the
+            backend takes text)
+        """
+        encoding = self.embedding_service.encoding
+        prepared = []
+        for content in contents:
+            chunks = []
+            for chunk in chunk_note(
+                content, encoding, max_tokens=max_tokens, overlap_tokens=overlap_tokens
+            ):
+                normalized = normalize_content(chunk)
+                if normalized.strip():
+                    chunks.append((chunk, normalized))
+            tokens = (
+                self.embedding_service.tokenize([normalized for _, normalized in chunks])
+                if chunks else []
+            )
+            prepared.append((chunks, tokens))
+        return prepared
 
-        # Prepare metadata (ChromaDB only supports primitive types)
-        metadata = {
-            "path": path,
-            "type": frontmatter.get("type", "insight"),
-            "confidence": frontmatter.get("confidence", ""),
-            "created": str(frontmatter.get("created", "")),
+    async def upsert_many(
+        self,
+        notes: List[Dict[str, Any]],
+        on_embedded: Optional[Callable[[int], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Index or update many Insights with one embedding batch.
+
+        Writes are queued and applied by the single writer together with
+        other pending writes; this returns once they are in the index.
+        Long notes are split into overlapping chunks, each stored as its
+        own record with the note's path, chunk_index and chunk_count.
+
+        A note may leave out 'content' and give its 'content_hash'
+        instead; it is reported 'unchanged' when the stored note has that
+        hash and frontmatter, and 'needs_content' otherwise, so callers
+        only send bodies that have to be embedded.
+
+        Args:
+            notes: Dicts with 'path', 'content' (or 'content_hash'),
+                'frontmatter' and optional 'mtime', 'size' and
+                'modified_at' keys
+            on_embedded: Called with the number of notes embedded, once
+                their embeddings are computed and before they are written
+
+        Returns:
+            One dict per distinct path with 'path', 'id' and 'status'
+            ('indexed', 'unchanged', 'needs_content' or 'error', with an
+            'error' message)
+        """
+        # Later notes for the same path win
+        latest = {note["path"]: note for note in notes}
+        if not latest:
+            return []
+
+        results: Dict[str, Dict[str, Any]] = {}
+        ops: List[WriteOp] = []
+        pending = []
+
+        for path, note in latest.items():
+            doc_id = self._generate_id(path)
+            stored = self._notes.get(path)
+
+            content = note.get("content")
+            if content is not None:
+                # Clients may send the body with its surrounding blank lines
+                # and CRLF line endings; fingerprint it as read from disk
+                content = canonical_body(content)
+                content_hash = compute_content_hash(content)
+            else:
+                content_hash = note.get("content_hash") or ""
+            metadata = self._build_metadata(
+                path,
+                content_hash,
+                note["frontmatter"],
+                note.get("mtime"),
+                note.get("size"),
+                note.get("modified_at"),
+            )
+
+            if stored is not None and self._is_unchanged(stored, metadata):
+                results[path] = {"path": path, "id": doc_id, "status": "unchanged"}
+                touched = self._touched_metadata(stored, note, metadata)
+                # A queued write for the path must still be replaced, even
+                # when the stored record is already current
+                if touched is not None or self.write_queue.has_pending(path):
+                    op = WriteOp("touch", path, doc_id, metadata=touched)
+                    op.result = results[path]
+                    ops.append(op)
+                continue
+
+            if content is None:
+                results[path] = {"path": path, "id": doc_id, "status": "needs_content"}
+                continue
+
+            results[path] = {"path": path, "id": doc_id, "status": "indexed"}
+            pending.append((path, doc_id, metadata, content))
+
+        if pending:
+            # Chunking and tokenizing long notes is CPU-bound
+            max_tokens, overlap_tokens = await self._get_chunk_budget()
+            prepared = await asyncio.to_thread(
+                self._prepare_chunks,
+                [content for _, _, _, content in pending],
+                max_tokens,
+                overlap_tokens,
+            )
+
+            texts: List[str] = []
+            token_lists: Optional[List[List[int]]] = []
+            embedded = []
+            for (path, doc_id, metadata, _), (chunks, tokens) in zip(pending, prepared):
+                if not chunks:
+                    logger.warning(f"Empty content for {path}, skipping")
+                    results[path] = {
+                        "path": path,
+                        "id": doc_id,
+                        "status": "error",
+                        "error": "Cannot index empty content",
+                    }
+                    continue
+                texts.extend(normalized for _, normalized in chunks)
+                if tokens is None:
+                    token_lists = None
+                elif token_lists is not None:
+                    token_lists.extend(tokens)
+                embedded.append((path, doc_id, metadata, chunks))
+
+            # Embed outside the writer so concurrent callers overlap
+            embeddings = (
+                await self.embedding_service.embed_batch(texts, token_lists)
+                if texts else []
+            )
+            if on_embedded is not None:
+                on_embedded(len(embedded))
+
+            offset = 0
+            for path, doc_id, metadata, chunks in embedded:
+                op = WriteOp("upsert", path, doc_id, records={
+                    "ids": self._chunk_ids(doc_id, len(chunks)),
+                    "embeddings": embeddings[offset:offset + len(chunks)],
+                    # Store original content for retrieval
+                    "documents": [chunk for chunk, _ in chunks],
+                    "metadatas": [
+                        {**metadata, "chunk_index": i, "chunk_count": len(chunks)}
+                        for i in range(len(chunks))
+                    ],
+                })
+                op.result = results[path]
+                ops.append(op)
+                offset += len(chunks)
+
+        if ops:
+            # Superseded writes report the result of the write that replaced them
+            for result in await self.write_queue.submit(ops):
+                results[result["path"]] = result
+
+        for result in results.values():
+            if result["status"] == "unchanged":
+                logger.debug(f"Unchanged Insight: {result['path']}, skipping")
+
+        return list(results.values())
+
+    async def _apply_writes(self, ops: List[WriteOp]):
+        """
+        Apply a batch of queued writes with one upsert, update and delete
+        call each (split only where Chroma's batch limit requires), then
+        bring the in-memory note index up to date.
+        """
+        stored_chunks = {
+            op.doc_id: int(self._notes[op.path].get("chunk_count", 1))
+            for op in ops
+            if op.path in self._notes
         }
 
-        # Upsert to collection
-        self.collection.upsert(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[content],  # Store original content for retrieval
-            metadatas=[metadata],
-        )
+        upsert: Dict[str, List[Any]] = {
+            "ids": [], "embeddings": [], "documents": [], "metadatas": [],
+        }
+        update_ids: List[str] = []
+        update_metadatas: List[Dict[str, Any]] = []
+        delete_ids: List[str] = []
+
+        for op in ops:
+            stored_ids = self._chunk_ids(op.doc_id, stored_chunks.get(op.doc_id, 0))
+            if op.kind == "upsert":
+                for key, values in op.records.items():
+                    upsert[key].extend(values)
+                # Chunks left over from a longer previous version
+                delete_ids.extend(stored_ids[len(op.records["ids"]):])
+            elif op.kind == "touch":
+                if op.metadata is None:
+                    continue
+                for i, chunk_id in enumerate(stored_ids):
+                    update_ids.append(chunk_id)
+                    update_metadatas.append({
+                        **op.metadata,
+                        "chunk_index": i,
+                        "chunk_count": len(stored_ids),
+                    })
+            elif op.kind == "delete":
+                op.result["status"] = "deleted" if stored_ids else "not_found"
+                delete_ids.extend(stored_ids)
+
+        step = self._max_chroma_batch
+        for start in range(0, len(upsert["ids"]), step):
+            await self._run("upsert", self.collection.upsert, **{
+                key: values[start:start + step] for key, values in upsert.items()
+            })
+        for start in range(0, len(update_ids), step):
+            # Metadata-only update, no re-embedding
+            await self._run(
+                "update",
+                self.collection.update,
+                ids=update_ids[start:start + step],
+                metadatas=update_metadatas[start:start + step],
+            )
+        for start in range(0, len(delete_ids), step):
+            await self._run("delete", self.collection.delete, ids=delete_ids[start:start + step])
+
+        if upsert["ids"] or update_ids or delete_ids:
+            self._bump_generation()
 
-        logger.info(f"Indexed Insight: {path} (id: {doc_id})")
-        return doc_id
+        for op in ops:
+            if op.kind == "upsert":
+                self._notes[op.path] = op.records["metadatas"][0]
+                logger.info(f"Indexed Insight: {op.path} (id: {op.doc_id})")
+            elif op.kind == "touch":
+                if op.metadata is not None and op.path in self._notes:
+                    self._notes[op.path] = {**self._notes[op.path], **op.metadata}
+            elif op.result["status"] == "deleted":
+                del self._notes[op.path]
+                logger.info(f"Deleted Insight: {op.path}")
 
     async def delete(self, path: str) -> bool:
         """
@@ -115,20 +648,235 @@ class ChromaStore:
         Returns:
             True if deleted, False if not found
         """
-        doc_id = self._generate_id(path)
+        return await self.delete_many([path]) > 0
 
-        try:
-            # Check if exists
-            result = self.collection.get(ids=[doc_id])
-            if not result["ids"]:
-                return False
+    async def delete_many(self, paths: List[str]) -> int:
+        """
+        Remove several Insights with one batched delete.
 
-            self.collection.delete(ids=[doc_id])
-            logger.info(f"Deleted Insight: {path}")
-            return True
+        Paths that are neither indexed nor queued for writing are skipped
+        without touching Chroma.
+
+        Args:
+            paths: Relative paths from vault root
+
+        Returns:
+            Number of Insights deleted
+        """
+        ops = [
+            WriteOp("delete", path, self._generate_id(path))
+            for path in dict.fromkeys(paths)
+            if path in self._notes or self.write_queue.has_pending(path)
+        ]
+        if not ops:
+            return 0
+
+        try:
+            results = await self.write_queue.submit(ops)
         except Exception as e:
-            logger.error(f"Failed to delete {path}: {e}")
+            logger.error(f"Failed to delete {len(ops)} Insights: {e}")
             raise
+        return sum(1 for result in results if result["status"] == "deleted")
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """
+        Remove every Insight under a folder, e.g. after it was deleted.
+
+        Args:
+            prefix: Folder path relative to vault root
+
+        Returns:
+            Number of Insights deleted
+        """
+        prefix = prefix.rstrip("/") + "/"
+        paths = [path for path in self._notes if path.startswith(prefix)]
+        paths.extend(self.write_queue.pending_paths(prefix))
+        deleted = await self.delete_many(paths)
+        logger.info(f"Deleted {deleted} Insights under {prefix}")
+        return deleted
+
+    async def move_many(self, moves: List[Tuple[str, str]]) -> int:
+        """
+        Re-key Insights to new paths, reusing their stored embeddings.
+
+        Each note's chunk records are copied under the new path's IDs with
+        the path metadata updated, and the old records are deleted in the
+        same write batch. No embedding calls are made.
+
+        Moves are applied as one change: a path that is both moved from
+        and moved to (a swap) ends up holding its new note, and a move out
+        of a path that is not indexed but was moved to earlier in the
+        batch continues that move (p -> q -> r re-keys p to r).
+
+        Args:
+            moves: (old path, new path) pairs relative to vault root, in
+                the order they happened
+
+        Returns:
+            Number of Insights moved; old paths that are not indexed are
+            skipped, so callers can index those from the file instead
+        """
+        paths = {path for move in moves for path in move}
+        # Copy what will be in the index, not what a queued write replaces
+        if any(self.write_queue.has_pending(path) for path in paths):
+            await self.write_queue.flush()
+
+        # Destination -> indexed path whose records it receives
+        origins: Dict[str, str] = {}
+        for src, dest in moves:
+            origin = src
+            if src not in self._notes and src in origins:
+                origin = origins.pop(src)
+            origins[dest] = origin
+        moves = [
+            (origin, dest) for dest, origin in origins.items()
+            if origin != dest and origin in self._notes
+        ]
+        if not moves:
+            return 0
+
+        source_ids = {
+            src: self._chunk_ids(
+                self._generate_id(src), int(self._notes[src].get("chunk_count", 1))
+            )
+            for src, _ in moves
+        }
+        stored = await self._run(
+            "get",
+            self.collection.get,
+            ids=[chunk_id for ids in source_ids.values() for chunk_id in ids],
+            include=["embeddings", "documents", "metadatas"],
+        )
+        records = {
+            chunk_id: (embedding, document, metadata)
+            for chunk_id, embedding, document, metadata in zip(
+                stored["ids"], stored["embeddings"], stored["documents"], stored["metadatas"]
+            )
+        }
+
+        ops: List[WriteOp] = []
+        moved_sources = set()
+        for src, dest in moves:
+            old_ids = source_ids[src]
+            if any(chunk_id not in records for chunk_id in old_ids):
+                logger.warning(f"Missing chunk records for {src}, not moving")
+                continue
+
+            new_id = self._generate_id(dest)
+            chunks = [records[chunk_id] for chunk_id in old_ids]
+            ops.append(WriteOp("upsert", dest, new_id, records={
+                "ids": self._chunk_ids(new_id, len(chunks)),
+                "embeddings": [list(embedding) for embedding, _, _ in chunks],
+                "documents": [document for _, document, _ in chunks],
+                "metadatas": [{**metadata, "path": dest} for _, _, metadata in chunks],
+            }))
+            moved_sources.add(src)
+
+        # Sources that also receive a note are overwritten, not deleted
+        destinations = {op.path for op in ops}
+        for src in sorted(moved_sources - destinations):
+            ops.append(WriteOp("delete", src, source_ids[src][0]))
+
+        if not ops:
+            return 0
+
+        await self.write_queue.submit(ops)
+        moved = len(destinations)
+        logger.info(f"Moved {moved} Insights without re-embedding")
+        return moved
+
+    async def move(self, src: str, dest: str) -> bool:
+        """
+        Re-key an Insight after a rename, reusing its stored embedding.
+
+        Returns:
+            True if moved, False if the old path is not indexed
+        """
+        return await self.move_many([(src, dest)]) > 0
+
+    async def move_prefix(self, src_prefix: str, dest_prefix: str) -> int:
+        """
+        Re-key every Insight under a renamed folder.
+
+        Returns:
+            Number of Insights moved
+        """
+        src_prefix = src_prefix.rstrip("/") + "/"
+        dest_prefix = dest_prefix.rstrip("/") + "/"
+        paths = set(path for path in self._notes if path.startswith(src_prefix))
+        paths.update(self.write_queue.pending_paths(src_prefix))
+        return await self.move_many([
+            (path, dest_prefix + path[len(src_prefix):]) for path in sorted(paths)
+        ])
+
+    async def flush(self):
+        """Write out queued index changes."""
+        await self.write_queue.close()
+
+    def _cached_query(self, cache_key: Tuple[str, int, float]) -> Optional[List[RetrievedInsight]]:
+        """Return cached results for a query, if still current."""
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and cached[0] == self._generation:
+            self._query_cache.move_to_end(cache_key)
+            self._query_cache_hits += 1
+            return list(cached[1])
+        self._query_cache_misses += 1
+        return None
+
+    def _cache_query(
+        self,
+        cache_key: Tuple[str, int, float],
+        generation: int,
+        insights: List[RetrievedInsight],
+    ):
+        """Cache query results computed at the given index generation."""
+        # Results computed across a concurrent write may already be stale
+        if self.query_cache_size > 0 and generation == self._generation:
+            self._query_cache[cache_key] = (generation, list(insights))
+            self._query_cache.move_to_end(cache_key)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+
+    @staticmethod
+    def _collect_insights(
+        results: Dict[str, Any],
+        row: int,
+        top_k: int,
+        min_similarity: float,
+    ) -> List[RetrievedInsight]:
+        """Aggregate the chunk hits of one query embedding to one result per note."""
+        # Results come back best first, so the first hit per path wins
+        insights: List[RetrievedInsight] = []
+        seen_paths = set()
+        for i, doc_id in enumerate(results["ids"][row]):
+            # ChromaDB returns L2 distance for cosine space: distance = 1 - similarity
+            distance = results["distances"][row][i]
+            similarity = 1 - distance
+
+            if similarity < min_similarity:
+                break
+
+            metadata = results["metadatas"][row][i]
+            path = metadata.get("path", "")
+            if path in seen_paths:
+                continue
+            seen_paths.add(path)
+
+            content = results["documents"][row][i]
+
+            insights.append(RetrievedInsight(
+                path=path,
+                content=content,
+                similarity=round(similarity, 4),
+                frontmatter={
+                    "type": metadata.get("type"),
+                    "confidence": metadata.get("confidence"),
+                    "created": metadata.get("created"),
+                },
+            ))
+            if len(insights) >= top_k:
+                break
+        return insights
 
     async def query(
         self,
@@ -139,6 +887,10 @@ class ChromaStore:
         """
         Query for related Insights.
 
+        Chunk hits are aggregated to one result per note, scored by its
+        best-matching chunk; for long notes the returned content is that
+        chunk rather than the whole note.
+
         Args:
             query_text: The Question content to search for
             top_k: Maximum number of results
@@ -147,57 +899,126 @@ class ChromaStore:
         Returns:
             List of retrieved Insights with similarity scores
         """
-        if self.collection.count() == 0:
+        # Normalize query
+        normalized_query = normalize_content(query_text)
+
+        cache_key = (normalized_query, top_k, min_similarity)
+        cached = self._cached_query(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._generation
+
+        if not self._notes:
             logger.warning("No Insights indexed yet")
             return []
 
-        # Normalize query
-        normalized_query = normalize_content(query_text)
+        # Nothing to search for, and the embeddings API rejects empty input
+        if not normalized_query:
+            return []
 
         # Generate query embedding
         query_embedding = await self.embedding_service.embed(normalized_query)
 
         # Query ChromaDB
-        results = self.collection.query(
+        results = await self._run(
+            "query",
+            self.collection.query,
             query_embeddings=[query_embedding],
-            n_results=top_k,
+            n_results=top_k * CHUNK_OVERSAMPLE,
             include=["documents", "metadatas", "distances"],
         )
 
-        insights = []
-        for i, doc_id in enumerate(results["ids"][0]):
-            # ChromaDB returns L2 distance for cosine space: distance = 1 - similarity
-            distance = results["distances"][0][i]
-            similarity = 1 - distance
-
-            if similarity < min_similarity:
-                continue
-
-            metadata = results["metadatas"][0][i]
-            content = results["documents"][0][i]
-
-            insights.append(RetrievedInsight(
-                path=metadata.get("path", ""),
-                content=content,
-                similarity=round(similarity, 4),
-                frontmatter={
-                    "type": metadata.get("type"),
-                    "confidence": metadata.get("confidence"),
-                    "created": metadata.get("created"),
-                },
-            ))
+        insights = self._collect_insights(results, 0, top_k, min_similarity)
 
         logger.info(
             f"Query returned {len(insights)} Insights "
             f"(from {len(results['ids'][0])} candidates)"
         )
+
+        self._cache_query(cache_key, generation, insights)
         return insights
 
+    async def query_many(
+        self,
+        query_texts: List[str],
+        top_k: int = 5,
+        min_similarity: float = 0.7,
+    ) -> List[List[RetrievedInsight]]:
+        """
+        Query for related Insights of many Questions at once.
+
+        Questions not in the query cache are embedded with one
+        embed_batch call and searched with one multi-vector collection
+        query; repeated Questions are searched once.
+
+        Args:
+            query_texts: The Question contents to search for
+            top_k: Maximum number of results per Question
+            min_similarity: Minimum cosine similarity threshold
+
+        Returns:
+            One list of retrieved Insights per query text, in input order
+        """
+        cache_keys = [
+            (normalize_content(query_text), top_k, min_similarity)
+            for query_text in query_texts
+        ]
+
+        found: Dict[Tuple[str, int, float], List[RetrievedInsight]] = {}
+        for cache_key in dict.fromkeys(cache_keys):
+            # Nothing to search for, and the embeddings API rejects empty input
+            if not cache_key[0]:
+                found[cache_key] = []
+                continue
+            cached = self._cached_query(cache_key)
+            if cached is not None:
+                found[cache_key] = cached
+        missing = [key for key in dict.fromkeys(cache_keys) if key not in found]
+        generation = self._generation
+
+        if missing and not self._notes:
+            logger.warning("No Insights indexed yet")
+            found.update((cache_key, []) for cache_key in missing)
+        elif missing:
+            query_embeddings = await self.embedding_service.embed_batch(
+                [normalized_query for normalized_query, _, _ in missing]
+            )
+            results = await self._run(
+                "query",
+                self.collection.query,
+                query_embeddings=query_embeddings,
+                n_results=top_k * CHUNK_OVERSAMPLE,
+                include=["documents", "metadatas", "distances"],
+            )
+            for row, cache_key in enumerate(missing):
+                insights = self._collect_insights(results, row, top_k, min_similarity)
+                self._cache_query(cache_key, generation, insights)
+                found[cache_key] = insights
+
+            logger.info(
+                f"Batch query for {len(query_texts)} Questions searched "
+                f"{len(missing)} ({len(query_texts) - len(missing)} cached or repeated)"
+            )
+
+        return [list(found[cache_key]) for cache_key in cache_keys]
+
+    def close(self):
+        """Release the Chroma thread pool and embedding resources."""
+        self._executor.shutdown(wait=True)
+        self.embedding_service.close()
+        if self.embedding_service.cache is not None:
+            self.embedding_service.cache.close()
+
     async def clear(self):
         """Clear all indexed Insights."""
-        self.client.delete_collection(COLLECTION_NAME)
-        self.collection = self.client.create_collection(
-            name=COLLECTION_NAME,
-            metadata={"hnsw:space": "cosine"},
-        )
+        async with self.write_queue.exclusive():
+            await self._run("clear", self.client.delete_collection, COLLECTION_NAME)
+            self.collection = await self._run(
+                "clear",
+                self.client.create_collection,
+                name=COLLECTION_NAME,
+                metadata={"hnsw:space": "cosine"},
+            )
+            self._notes.clear()
+            self._bump_generation()
         logger.info("Cleared all indexed Insights")
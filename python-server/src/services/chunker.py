@@ -0,0 +1,167 @@
+"""Heading-aware chunking of long notes for embedding."""
+
+import re
+from typing import List, Tuple
+
+import tiktoken
+
+# Bump when chunk_note output changes, so that notes indexed with the
+# previous chunking are re-embedded
+CHUNKER_VERSION = 2
+
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_APPROXIMATE_TOKEN_RE = re.compile(r"[\x00-\x7f]{1,3}|[^\x00-\x7f]")
+
+
+class ApproximateEncoding:
+    """
+    Stand-in tokenizer for models whose own tokenizer is not at hand.
+
+    Counts up to three ASCII characters, or any single other character,
+    as one token. That errs on the long side of word-piece tokenizers,
+    so chunks sized with it fit the model, and no tokenizer files have
+    to be downloaded.
+    """
+
+    def encode(self, text: str, disallowed_special=()) -> List[str]:
+        return _APPROXIMATE_TOKEN_RE.findall(text)
+
+    def encode_batch(self, texts: List[str], disallowed_special=()) -> List[List[str]]:
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+
+def _split_sections(content: str) -> List[Tuple[str, str]]:
+    """Split markdown into (heading, text) sections at headings outside code fences."""
+    sections: List[Tuple[str, str]] = []
+    heading = ""
+    lines: List[str] = []
+    in_fence = False
+
+    for line in content.splitlines(keepends=True):
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and _HEADING_RE.match(line):
+            if lines:
+                sections.append((heading, "".join(lines)))
+            heading = line.strip()
+            lines = []
+        lines.append(line)
+
+    if lines:
+        sections.append((heading, "".join(lines)))
+    return sections
+
+
+def _tail(text: str, encoding: tiktoken.Encoding, max_tokens: int) -> str:
+    """Return roughly the last max_tokens of text, starting at a word boundary."""
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    tail = encoding.decode(tokens[-max_tokens:])
+    boundary = tail.find(" ")
+    return tail[boundary + 1:] if boundary != -1 else tail
+
+
+def chunk_note(
+    content: str,
+    encoding: tiktoken.Encoding,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 100,
+) -> List[str]:
+    """
+    Split a note into overlapping chunks of at most about max_tokens.
+
+    Notes that fit in one chunk are returned unchanged. Longer notes are
+    split at headings, then at paragraphs, and only then at token
+    boundaries. A chunk that starts mid-section repeats the section
+    heading, and each chunk after the first starts with up to the last
+    overlap_tokens of the previous one, as far as the budget allows.
+    """
+    # Every token covers at least one ASCII character, but a single CJK
+    # or Hangul character can take several tokens
+    if content.isascii() and len(content) <= max_tokens:
+        return [content]
+
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    if count(content) <= max_tokens:
+        return [content]
+
+    unit_limit = max(1, max_tokens - overlap_tokens)
+
+    # (heading, text, tokens, starts_section)
+    units: List[Tuple[str, str, int, bool]] = []
+    for heading, section in _split_sections(content):
+        section = section.strip()
+        if not section:
+            continue
+        tokens = count(section)
+        if tokens <= unit_limit:
+            units.append((heading, section, tokens, True))
+            continue
+
+        first = True
+        for paragraph in _PARAGRAPH_RE.split(section):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            paragraph_tokens = encoding.encode(paragraph, disallowed_special=())
+            if len(paragraph_tokens) <= unit_limit:
+                units.append((heading, paragraph, len(paragraph_tokens), first))
+                first = False
+                continue
+
+            start = 0
+            while start < len(paragraph_tokens):
+                end = min(start + unit_limit, len(paragraph_tokens))
+                piece = encoding.decode(paragraph_tokens[start:end])
+                # A CJK character can span tokens; cut before it, not through it
+                while end < len(paragraph_tokens) and end - start > 1 and piece.endswith("\ufffd"):
+                    end -= 1
+                    piece = encoding.decode(paragraph_tokens[start:end])
+                units.append((heading, piece, end - start, first))
+                first = False
+                start = end
+
+    separator_tokens = count("\n\n")
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def add(text: str, tokens: int) -> None:
+        nonlocal current_tokens
+        if current:
+            current_tokens += separator_tokens
+        current.append(text)
+        current_tokens += tokens
+
+    for heading, text, tokens, starts_section in units:
+        if current and current_tokens + separator_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+            # The repeated heading and the overlap get whatever the next
+            # unit leaves of the budget, and are dropped if nothing is left
+            budget = max_tokens - tokens
+            if heading and not starts_section:
+                heading_tokens = count(heading)
+                if heading_tokens + separator_tokens <= budget:
+                    add(heading, heading_tokens)
+                    budget -= heading_tokens + separator_tokens
+            overlap_budget = min(overlap_tokens, budget - separator_tokens)
+            if overlap_budget > 0:
+                overlap = _tail(chunks[-1], encoding, overlap_budget)
+                overlap_tokens_used = count(overlap)
+                if overlap_tokens_used + separator_tokens <= budget:
+                    add(overlap, overlap_tokens_used)
+
+        add(text, tokens)
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
@@ -0,0 +1,128 @@
+"""Coalescing debounce scheduler for events arriving from other threads."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DebounceScheduler(Generic[K, V]):
+    """
+    Collect keyed events and hand them over in batches.
+
+    submit() may be called from any thread; events are moved onto the
+    event loop with call_soon_threadsafe. A batch is flushed once no new
+    event has arrived for quiet_period seconds, or max_latency seconds
+    after its first event, whichever comes first, so a steady stream of
+    events cannot postpone indexing indefinitely. Events with the same
+    key are merged (by default the latest wins). Flushes run one at a
+    time; events arriving during a flush keep merging into one pending
+    batch, which is flushed once the running flush has finished, so a
+    slow flush holds back the next batch rather than queueing more.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        flush: Callable[[Dict[K, V]], Awaitable[None]],
+        quiet_period: float = 0.3,
+        max_latency: float = 2.0,
+        merge: Optional[Callable[[V, V], V]] = None,
+    ):
+        self.loop = loop
+        self.flush = flush
+        self.quiet_period = quiet_period
+        self.max_latency = max_latency
+        self.merge = merge or (lambda old, new: new)
+
+        # Only touched on the loop thread
+        self._pending: Dict[K, V] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self._tasks: set = set()
+
+        self.events_received = 0
+        self.batches_flushed = 0
+
+    def submit(self, key: K, value: V):
+        """Add an event; safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self._add, key, value)
+
+    def _add(self, key: K, value: V):
+        now = time.monotonic()
+        if not self._pending:
+            self._first_event = now
+        self._last_event = now
+        self.events_received += 1
+
+        previous = self._pending.get(key)
+        self._pending[key] = value if previous is None else self.merge(previous, value)
+
+        if self._timer is None:
+            self._timer = self.loop.call_later(self.quiet_period, self._check)
+
+    def _check(self):
+        self._timer = None
+        if not self._pending:
+            return
+
+        now = time.monotonic()
+        due = min(
+            self._last_event + self.quiet_period,
+            self._first_event + self.max_latency,
+        )
+        if now < due:
+            self._timer = self.loop.call_at(self.loop.time() + (due - now), self._check)
+            return
+        if self._flush_lock.locked():
+            # Checked again when the running flush finishes
+            self._timer = self.loop.call_later(self.quiet_period, self._check)
+            return
+
+        self._start_flush()
+
+    def _start_flush(self):
+        batch, self._pending = self._pending, {}
+        task = self.loop.create_task(self._run_flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_flush(self, batch: Dict[K, V]):
+        async with self._flush_lock:
+            self.batches_flushed += 1
+            try:
+                await self.flush(batch)
+            except Exception as e:
+                logger.error(f"Failed to process {len(batch)} debounced events: {e}")
+
+        # Events held back during the flush may already be due
+        if self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = self.loop.call_later(0, self._check)
+
+    async def close(self, flush_pending: bool = True):
+        """Stop the timer and wait for in-flight flushes."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if flush_pending and self._pending:
+            self._start_flush()
+        else:
+            self._pending = {}
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return scheduler counters."""
+        return {
+            "pending": len(self._pending),
+            "events_received": self.events_received,
+            "batches_flushed": self.batches_flushed,
+        }
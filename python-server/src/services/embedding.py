@@ -1,81 +1,203 @@
-"""OpenAI embedding service for generating text embeddings."""
+"""Embedding service for generating text embeddings."""
 
-from openai import AsyncOpenAI
-from typing import List, Optional
+from typing import Dict, List, Optional
+import asyncio
 import logging
 import tiktoken
 
+from .embedding_backends import EmbeddingBackend
+from .embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 
-class EmbeddingService:
-    """Service for generating text embeddings using OpenAI."""
+class _CoalescedBatch:
+    """embed() calls collected to be sent as one request."""
 
-    MAX_TOKENS = 8191  # text-embedding-3-small limit
-    SAFE_TOKEN_LIMIT = 6000  # Leave buffer for safety
+    def __init__(self):
+        self.futures: Dict[str, List[asyncio.Future]] = {}
+        self.calls = 0
+        self.full = asyncio.Event()
+
+
+class EmbeddingService:
+    """Service for generating text embeddings through a pluggable backend."""
 
     def __init__(
         self,
-        api_key: str,
-        model: str = "text-embedding-3-small",
+        backend: EmbeddingBackend,
+        cache: Optional[EmbeddingCache] = None,
+        max_batch_size: int = 256,
+        coalesce_window: float = 0.005,
     ):
-        self.client = AsyncOpenAI(api_key=api_key)
-        self.model = model
-        self._encoding: Optional[tiktoken.Encoding] = None
+        self.backend = backend
+        self.model = backend.model
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self._dimension: Optional[int] = None
+
+        # Single embed() calls waiting to be sent together
+        self.coalesce_window = coalesce_window
+        self._open_batch: Optional[_CoalescedBatch] = None
+        self._coalesce_tasks: set = set()
+        self._coalesced_calls = 0
+        self._coalesced_batches = 0
+        self._largest_coalesced_batch = 0
 
     @property
     def encoding(self) -> tiktoken.Encoding:
-        """Lazy load tokenizer."""
-        if self._encoding is None:
-            try:
-                self._encoding = tiktoken.encoding_for_model(self.model)
-            except KeyError:
-                self._encoding = tiktoken.get_encoding("cl100k_base")
-        return self._encoding
+        """The backend's tokenizer, used for chunking and token counts."""
+        return self.backend.encoding
 
-    def count_tokens(self, text: str) -> int:
-        """Count tokens in text."""
-        return len(self.encoding.encode(text))
+    def tokenize(self, texts: List[str]) -> Optional[List[List[int]]]:
+        """Tokenize texts for embed_batch, or None if the backend takes text; blocking."""
+        return self.backend.tokenize(texts)
 
-    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
-        """Truncate text to fit within token limit."""
-        tokens = self.encoding.encode(text)
-        if len(tokens) <= max_tokens:
-            return text
+    async def max_input_tokens(self) -> Optional[int]:
+        """Longest input the backend embeds without truncating, if limited."""
+        return await self.backend.max_input_tokens()
 
-        truncated_tokens = tokens[:max_tokens]
-        truncated_text = self.encoding.decode(truncated_tokens)
+    @property
+    def dimension(self) -> Optional[int]:
+        """Embedding dimension, if known yet."""
+        return self.backend.dimension or self._dimension
 
-        logger.warning(
-            f"Text truncated from {len(tokens)} to {max_tokens} tokens"
-        )
-        return truncated_text
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text."""
+        return len(self.encoding.encode(text, disallowed_special=()))
 
     async def embed(self, text: str) -> List[float]:
-        """Generate embedding for a single text."""
-        # Truncate if necessary
-        safe_text = self.truncate_to_tokens(text, self.SAFE_TOKEN_LIMIT)
-
-        response = await self.client.embeddings.create(
-            input=safe_text,
-            model=self.model,
-        )
-
-        return response.data[0].embedding
-
-    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
-        # Truncate all texts
-        safe_texts = [
-            self.truncate_to_tokens(text, self.SAFE_TOKEN_LIMIT)
-            for text in texts
-        ]
-
-        response = await self.client.embeddings.create(
-            input=safe_texts,
-            model=self.model,
-        )
-
-        # Sort by index to ensure correct order
-        sorted_data = sorted(response.data, key=lambda x: x.index)
-        return [item.embedding for item in sorted_data]
+        """
+        Generate embedding for a single text.
+
+        Concurrent calls are coalesced: texts arriving within
+        coalesce_window seconds of each other, or while the rate limiter
+        holds requests back, are sent together in one embed_batch call and
+        the vectors are fanned back out to each caller.
+        """
+        if self.cache is not None:
+            cached = (await asyncio.to_thread(self.cache.get_many, self.model, [text]))[0]
+            if cached is not None:
+                return cached
+
+        batch = self._open_batch
+        if batch is None:
+            batch = self._open_batch = _CoalescedBatch()
+            task = asyncio.create_task(self._send_coalesced(batch))
+            self._coalesce_tasks.add(task)
+            task.add_done_callback(self._coalesce_tasks.discard)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.futures.setdefault(text, []).append(future)
+        batch.calls += 1
+        if len(batch.futures) >= self.max_batch_size:
+            # Full batches go out without waiting for the window
+            self._open_batch = None
+            batch.full.set()
+        return await future
+
+    async def _send_coalesced(self, batch: _CoalescedBatch):
+        """Send coalesced embed() calls after the window closes."""
+        if self.coalesce_window > 0:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.coalesce_window)
+            except asyncio.TimeoutError:
+                pass
+        await self.backend.wait_until_ready()
+        if self._open_batch is batch:
+            self._open_batch = None
+
+        self._coalesced_calls += batch.calls
+        self._coalesced_batches += 1
+        self._largest_coalesced_batch = max(self._largest_coalesced_batch, batch.calls)
+
+        # embed() already looked these up in the cache
+        texts = list(batch.futures)
+        try:
+            embeddings = await self._embed_uncached(texts)
+        except Exception as e:
+            for futures in batch.futures.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for text, embedding in zip(texts, embeddings):
+            for future in batch.futures[text]:
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def embed_batch(
+        self,
+        texts: List[str],
+        token_lists: Optional[List[List[int]]] = None,
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Cached texts are served locally; the rest are embedded once per
+        distinct text by the backend. Output order matches input order.
+
+        Args:
+            texts: Texts to embed
+            token_lists: The texts already run through tokenize(), so the
+                backend does not tokenize them again
+        """
+        if self.cache is not None:
+            results = await asyncio.to_thread(self.cache.get_many, self.model, texts)
+        else:
+            results = [None] * len(texts)
+
+        # Only embed texts that missed the cache, once per distinct text
+        missing = list(dict.fromkeys(
+            text for text, result in zip(texts, results) if result is None
+        ))
+        if missing:
+            missing_tokens = None
+            if token_lists is not None:
+                tokens_by_text = dict(zip(texts, token_lists))
+                missing_tokens = [tokens_by_text[text] for text in missing]
+            embedded = await self._embed_uncached(missing, missing_tokens)
+            by_text: Dict[str, List[float]] = dict(zip(missing, embedded))
+            results = [
+                result if result is not None else by_text[text]
+                for text, result in zip(texts, results)
+            ]
+
+        if results and self._dimension is None:
+            self._dimension = len(results[0])
+        return results
+
+    async def _embed_uncached(
+        self,
+        texts: List[str],
+        token_lists: Optional[List[List[int]]] = None,
+    ) -> List[List[float]]:
+        """Embed distinct texts with the backend and cache them, skipping the lookup."""
+        embeddings = await self.backend.embed_texts(texts, token_lists)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put_many, self.model, texts, embeddings)
+        if embeddings and self._dimension is None:
+            self._dimension = len(embeddings[0])
+        return embeddings
+
+    def close(self):
+        """Release backend resources."""
+        self.backend.close()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return embedding cache counters, empty if caching is disabled."""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def scheduler_stats(self) -> Dict[str, float]:
+        """Return backend scheduling counters."""
+        return self.backend.stats()
+
+    def coalescer_stats(self) -> Dict[str, int]:
+        """Return counters for coalesced embed() calls."""
+        return {
+            "calls": self._coalesced_calls,
+            "batches": self._coalesced_batches,
+            "round_trips_saved": self._coalesced_calls - self._coalesced_batches,
+            "largest_batch": self._largest_coalesced_batch,
+        }
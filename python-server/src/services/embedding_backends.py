@@ -0,0 +1,305 @@
+"""Embedding backends: OpenAI API and local CPU models."""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+
+from openai import AsyncOpenAI
+import tiktoken
+
+from .chunker import ApproximateEncoding
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MODEL_PREFIX = "local:"
+
+OPENAI_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+
+class EmbeddingBackend(ABC):
+    """Computes embeddings for batches of texts."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.dimension: Optional[int] = None
+        self._encoding: Optional[tiktoken.Encoding] = None
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        """Lazy load tokenizer used for chunking and token counts."""
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        return self._encoding
+
+    async def max_input_tokens(self) -> Optional[int]:
+        """Longest input, in encoding tokens, the model reads without truncating."""
+        return None
+
+    def tokenize(self, texts: List[str]) -> Optional[List[List[int]]]:
+        """
+        Tokenize texts as embed_texts sends them, or return None if the
+        backend takes text. Blocking; lets callers tokenize off the loop.
+        """
+        return None
+
+    @abstractmethod
+    async def embed_texts(
+        self,
+        texts: List[str],
+        token_lists: Optional[List[List[int]]] = None,
+    ) -> List[List[float]]:
+        """Embed texts, returning vectors in input order; token_lists come from tokenize()."""
+
+    async def wait_until_ready(self):
+        """Wait until a request could start without being throttled."""
+
+    def stats(self) -> Dict[str, float]:
+        """Return backend counters."""
+        return {}
+
+    def close(self):
+        """Release backend resources."""
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Embeddings from the OpenAI API, rate limited and token-batched."""
+
+    MAX_TOKENS = 8191  # text-embedding-3-small limit
+    SAFE_TOKEN_LIMIT = 6000  # Leave buffer for safety
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        max_batch_size: int = 256,
+        max_batch_tokens: int = 200000,
+        max_concurrency: int = 4,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        super().__init__(model)
+        # Retries are handled by the rate limiter, not the client
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+        self.dimension = OPENAI_DIMENSIONS.get(model)
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def max_input_tokens(self) -> Optional[int]:
+        return self.SAFE_TOKEN_LIMIT
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize texts once each, truncating to SAFE_TOKEN_LIMIT."""
+        token_lists = self.encoding.encode_batch(texts, disallowed_special=())
+
+        for i, tokens in enumerate(token_lists):
+            if len(tokens) > self.SAFE_TOKEN_LIMIT:
+                logger.warning(
+                    f"Text truncated from {len(tokens)} to {self.SAFE_TOKEN_LIMIT} tokens"
+                )
+                token_lists[i] = tokens[:self.SAFE_TOKEN_LIMIT]
+        return token_lists
+
+    def _split_batches(self, token_lists: List[List[int]]) -> List[List[int]]:
+        """Group input indices into sub-batches bounded by count and tokens."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, tokens in enumerate(token_lists):
+            if current and (
+                len(current) >= self.max_batch_size
+                or current_tokens + len(tokens) > self.max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += len(tokens)
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _embed_tokens(self, token_lists: List[List[int]]) -> List[List[float]]:
+        """Embed pre-tokenized inputs in one API request."""
+        async with self._semaphore:
+            response = await self.rate_limiter.run(
+                lambda: self.client.embeddings.create(
+                    input=token_lists,
+                    model=self.model,
+                ),
+                tokens=sum(len(tokens) for tokens in token_lists),
+            )
+
+        # Sort by index to ensure correct order
+        sorted_data = sorted(response.data, key=lambda x: x.index)
+        return [item.embedding for item in sorted_data]
+
+    async def embed_texts(
+        self,
+        texts: List[str],
+        token_lists: Optional[List[List[int]]] = None,
+    ) -> List[List[float]]:
+        """
+        Embed texts through the OpenAI API.
+
+        Inputs are split into sub-batches by item count and token budget,
+        which are sent concurrently (up to max_concurrency requests across
+        all callers). Output order matches input order.
+        """
+        if token_lists is None:
+            token_lists = await asyncio.to_thread(self.tokenize, texts)
+        batches = self._split_batches(token_lists)
+
+        batch_embeddings = await asyncio.gather(*(
+            self._embed_tokens([token_lists[i] for i in batch])
+            for batch in batches
+        ))
+
+        embeddings: List[List[float]] = [[] for _ in texts]
+        for batch, vectors in zip(batches, batch_embeddings):
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
+        return embeddings
+
+    async def wait_until_ready(self):
+        await self.rate_limiter.wait_until_ready()
+
+    def stats(self) -> Dict[str, float]:
+        return self.rate_limiter.stats()
+
+
+# Models loaded in each worker process, by name
+_worker_models: Dict[str, Any] = {}
+
+
+def _encode_in_worker(model_name: str, texts: List[str]) -> List[List[float]]:
+    """Embed texts with a sentence-transformers model inside a worker process."""
+    model = _worker_models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device="cpu")
+        _worker_models[model_name] = model
+
+    vectors = model.encode(texts, batch_size=32, normalize_embeddings=True)
+    return vectors.tolist()
+
+
+def _max_seq_length_in_worker(model_name: str) -> int:
+    """Return the word pieces a model reads before truncating, loading it if needed."""
+    model = _worker_models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device="cpu")
+        _worker_models[model_name] = model
+    return model.max_seq_length
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """
+    Embeddings from a local sentence-transformers model.
+
+    The model runs on CPU in a pool of worker processes, so encoding does
+    not hold the server's GIL and no network access is needed once the
+    model is available locally. Token counts use ApproximateEncoding
+    rather than the model's word-piece tokenizer.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        workers: int = 1,
+        batch_size: int = 64,
+    ):
+        super().__init__(model)
+        if importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError(
+                "Local embedding models require sentence-transformers: "
+                "pip install sentence-transformers"
+            )
+
+        self.model_name = model[len(LOCAL_MODEL_PREFIX):]
+        self.batch_size = batch_size
+        # Spawn rather than fork: the server process runs threads
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._encoding = ApproximateEncoding()
+        self._max_seq_length: Optional[int] = None
+
+    async def max_input_tokens(self) -> Optional[int]:
+        """The model's max_seq_length, e.g. 256 for all-MiniLM-L6-v2."""
+        if self._max_seq_length is None:
+            loop = asyncio.get_running_loop()
+            self._max_seq_length = await loop.run_in_executor(
+                self._pool, _max_seq_length_in_worker, self.model_name
+            )
+        return self._max_seq_length
+
+    async def embed_texts(
+        self,
+        texts: List[str],
+        token_lists: Optional[List[List[int]]] = None,
+    ) -> List[List[float]]:
+        """Embed texts in the worker pool, one task per batch_size texts."""
+        loop = asyncio.get_running_loop()
+        batches = [
+            texts[start:start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _encode_in_worker, self.model_name, batch)
+            for batch in batches
+        ))
+
+        embeddings = [vector for batch in results for vector in batch]
+        if embeddings and self.dimension is None:
+            self.dimension = len(embeddings[0])
+        return embeddings
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_embedding_backend(
+    model: str,
+    openai_api_key: Optional[str] = None,
+    max_batch_size: int = 256,
+    max_batch_tokens: int = 200000,
+    max_concurrency: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    local_workers: int = 1,
+) -> EmbeddingBackend:
+    """
+    Create the embedding backend for a model name.
+
+    Names starting with "local:" (e.g. "local:all-MiniLM-L6-v2") select a
+    local sentence-transformers model; anything else is an OpenAI model.
+    """
+    if model.startswith(LOCAL_MODEL_PREFIX):
+        return LocalEmbeddingBackend(model=model, workers=local_workers)
+
+    if not openai_api_key:
+        raise ValueError(f"OPENAI_API_KEY is required for embedding model {model}")
+
+    return OpenAIEmbeddingBackend(
+        api_key=openai_api_key,
+        model=model,
+        max_batch_size=max_batch_size,
+        max_batch_tokens=max_batch_tokens,
+        max_concurrency=max_concurrency,
+        rate_limiter=rate_limiter,
+    )
@@ -0,0 +1,172 @@
+"""Persistent content-hash cache for text embeddings."""
+
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import hashlib
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed LRU cache of embeddings.
+
+    Entries are keyed by a hash of the embedding model name and the text
+    that was embedded, so a note whose normalized content did not change
+    never needs another embedding API call.
+
+    Lookups only read: the recency of hits is kept in memory and written
+    together with the next put_many (which is when eviction needs it),
+    or once touch_batch hits have piled up. The methods block on SQLite,
+    so async callers should run them in a thread.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50000, touch_batch: int = 1000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, "
+            "embedding BLOB NOT NULL, "
+            "last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+            "ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()
+        self._size, self._clock = row
+        # Key -> last_used for hits not written yet
+        self._touched: Dict[str, int] = {}
+
+        logger.info(f"Embedding cache loaded with {self._size} entries")
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key for a model and text."""
+        return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings.
+
+        Returns:
+            A list aligned with texts holding the embedding, or None on a miss
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, embedding FROM embeddings "
+                    f"WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                self._clock += 1
+                for key in found:
+                    self._touched[key] = self._clock
+                if len(self._touched) >= self.touch_batch:
+                    self._write_touched()
+                    self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for result in results if result is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+
+        return results
+
+    def _write_touched(self):
+        """Write pending last_used updates; caller holds the lock and commits."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._touched = {}
+
+    def put_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[List[float]],
+    ):
+        """Store embeddings and evict the least recently used overflow."""
+        if not texts:
+            return
+
+        with self._lock:
+            self._write_touched()
+            self._clock += 1
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, embedding, last_used) "
+                "VALUES (?, ?, ?)",
+                [
+                    (self.make_key(model, text), array("f", embedding).tobytes(), self._clock)
+                    for text, embedding in zip(texts, embeddings)
+                ],
+            )
+            self._size += max(cursor.rowcount, 0)
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                self.evictions += overflow
+
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._write_touched()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,149 @@
+"""Bounded work queue for indexing changed note files."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+from .chroma_store import ChromaStore
+from .metrics import LatencyStats
+from .note_parser import parse_note, get_relative_path
+
+logger = logging.getLogger(__name__)
+
+
+class IndexWorkQueue:
+    """
+    Queue of note files to index, drained by a fixed pool of workers.
+
+    At most max_queued files wait at a time; put() blocks when the queue
+    is full, so producers slow down instead of piling up work. A file
+    already waiting is not queued twice, since its worker reads the
+    latest version anyway. Each worker takes up to batch_size waiting
+    files and indexes them with one upsert_many call, so no more than
+    workers batches are embedding and writing at once.
+    """
+
+    def __init__(
+        self,
+        chroma_store: ChromaStore,
+        vault_path: Path,
+        workers: int = 2,
+        max_queued: int = 1000,
+        batch_size: int = 64,
+    ):
+        self.chroma_store = chroma_store
+        self.vault_path = vault_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self._queue: "asyncio.Queue[Path]" = asyncio.Queue(maxsize=max_queued)
+        # Enqueue time of each waiting file
+        self._queued: Dict[Path, float] = {}
+        self._tasks: List[asyncio.Task] = []
+
+        self.latency = LatencyStats()
+        self.max_depth = 0
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.deduplicated = 0
+
+    def start(self):
+        """Start the worker tasks."""
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def put(self, file_path: Path):
+        """Queue a file for indexing, waiting while the queue is full."""
+        if file_path in self._queued:
+            self.deduplicated += 1
+            return
+        self._queued[file_path] = time.monotonic()
+        await self._queue.put(file_path)
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    async def join(self):
+        """Wait until every queued file has been processed."""
+        await self._queue.join()
+
+    def _take_batch(self, first: Path) -> List[Path]:
+        batch = [first]
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = self._take_batch(await self._queue.get())
+            # Later changes to these files must be queued again
+            enqueued = [self._queued.pop(file_path, time.monotonic()) for file_path in batch]
+            self.in_flight += len(batch)
+            try:
+                await self._index(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"Failed to index {len(batch)} changed Insights: {e}")
+            finally:
+                self.in_flight -= len(batch)
+                now = time.monotonic()
+                for started in enqueued:
+                    self.latency.record(now - started)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _index(self, batch: List[Path]):
+        parsed = await asyncio.gather(
+            *(asyncio.to_thread(parse_note, file_path) for file_path in batch),
+            return_exceptions=True,
+        )
+
+        notes: List[Dict[str, Any]] = []
+        for file_path, note in zip(batch, parsed):
+            if isinstance(note, Exception):
+                # Deleted or mid-write; a later event will catch up
+                self.failed += 1
+                continue
+            notes.append({
+                "path": get_relative_path(file_path, self.vault_path),
+                "content": note["content"],
+                "frontmatter": note["frontmatter"],
+                "mtime": note["mtime"],
+                "size": note["size"],
+            })
+
+        if not notes:
+            return
+
+        for result in await self.chroma_store.upsert_many(notes):
+            if result["status"] == "error":
+                self.failed += 1
+                logger.warning(f"Failed to index {result['path']}: {result['error']}")
+            else:
+                self.processed += 1
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = 30.0):
+        """Stop the workers, first finishing queued files if drain is set."""
+        if drain and self._tasks:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self._queue.qsize()} queued Insight updates")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth, counters and enqueue-to-indexed latency."""
+        latency = self.latency.as_dict()
+        return {
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            **{f"latency_{key}": value for key, value in latency.items() if key != "count"},
+        }
@@ -0,0 +1,194 @@
+"""Streaming ingest of newline-delimited JSON note records."""
+
+import asyncio
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+from pydantic import ValidationError
+
+from .chroma_store import ChromaStore
+from ..api.schemas import BatchNotePayload
+
+logger = logging.getLogger(__name__)
+
+# Longest record accepted; a longer line aborts the ingest rather than
+# growing the read buffer without bound
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+
+
+class IngestError(Exception):
+    """The request body cannot be read as NDJSON records."""
+
+
+async def read_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = MAX_RECORD_BYTES,
+) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines as the chunks arrive."""
+    buffer = bytearray()
+    # Position up to which buffer is known to hold no newline
+    scanned = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", scanned)) != -1:
+            yield bytes(buffer[start:end])
+            start = scanned = end + 1
+        del buffer[:start]
+        scanned = len(buffer)
+        if scanned > max_line_bytes:
+            raise IngestError(f"Record longer than {max_line_bytes} bytes")
+    if buffer:
+        yield bytes(buffer)
+
+
+class NoteIngest:
+    """
+    Index note records from an NDJSON stream while it is being received.
+
+    One reader parses and validates records and hands them to a queue
+    of at most batch_size * concurrency records; concurrency workers
+    each collect up to batch_size records, waiting at most linger
+    seconds for more after the first, and index them with one
+    upsert_many call. Reading stalls while the queue is full, so only a
+    bounded number of notes is held in memory however large the upload.
+    Results come out per record, in the order they complete.
+    """
+
+    def __init__(
+        self,
+        chroma_store: ChromaStore,
+        batch_size: int = 64,
+        concurrency: int = 2,
+        linger: float = 0.05,
+        max_line_bytes: int = MAX_RECORD_BYTES,
+    ):
+        self.chroma_store = chroma_store
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.linger = linger
+        self.max_line_bytes = max_line_bytes
+        self.counts: Counter = Counter()
+        self.records = 0
+        self.error: Optional[str] = None
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ingest the records in chunks, yielding one result dict per record
+        with 'line', 'path', 'status', 'insight_id' and 'error' keys.
+        """
+        records: "asyncio.Queue[Optional[Tuple[int, BatchNotePayload]]]" = asyncio.Queue(
+            maxsize=self.batch_size * self.concurrency
+        )
+        results: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+        async def pipeline():
+            try:
+                await asyncio.gather(
+                    self._read(chunks, records, results),
+                    *(self._index(records, results) for _ in range(self.concurrency)),
+                )
+            finally:
+                results.put_nowait(None)
+
+        task = asyncio.create_task(pipeline())
+        try:
+            while (result := await results.get()) is not None:
+                self.counts[result["status"]] += 1
+                yield result
+            await task
+        finally:
+            # Client went away: stop reading and indexing
+            task.cancel()
+
+    async def _read(self, chunks, records: asyncio.Queue, results: asyncio.Queue):
+        line = 0
+        try:
+            async for raw in read_lines(chunks, self.max_line_bytes):
+                line += 1
+                if not raw.strip():
+                    continue
+                self.records += 1
+                try:
+                    note = BatchNotePayload.model_validate_json(raw)
+                except ValidationError as e:
+                    results.put_nowait(self._error(line, "", f"Invalid record: {e}"))
+                    continue
+                await records.put((line, note))
+        except Exception as e:
+            self.error = f"Stopped reading after line {line}: {e}"
+            logger.warning(f"Ingest aborted: {self.error}")
+        finally:
+            for _ in range(self.concurrency):
+                await records.put(None)
+
+    async def _index(self, records: asyncio.Queue, results: asyncio.Queue):
+        while True:
+            item = await records.get()
+            if item is None:
+                return
+            batch = [item]
+            finished = False
+            # Records trickle in as the upload arrives; wait briefly for
+            # more rather than embedding and writing them one by one
+            deadline = asyncio.get_running_loop().time() + self.linger
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    item = await asyncio.wait_for(records.get(), max(timeout, 0))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                batch.append(item)
+
+            for result in await self._index_batch(batch):
+                results.put_nowait(result)
+            if finished:
+                return
+
+    async def _index_batch(self, batch: List[Tuple[int, BatchNotePayload]]) -> List[Dict[str, Any]]:
+        try:
+            indexed = await self.chroma_store.upsert_many([
+                {
+                    "path": note.path,
+                    "content": note.content,
+                    "content_hash": note.content_hash,
+                    "frontmatter": note.frontmatter,
+                    "modified_at": note.modified_at,
+                }
+                for _, note in batch
+            ])
+        except Exception as e:
+            logger.error(f"Failed to ingest batch of {len(batch)} notes: {e}")
+            return [self._error(line, note.path, str(e)) for line, note in batch]
+
+        # Records repeating a path share the result of the latest one
+        by_path = {result["path"]: result for result in indexed}
+        return [
+            {
+                "line": line,
+                "path": note.path,
+                "status": by_path[note.path]["status"],
+                "insight_id": by_path[note.path]["id"],
+                "error": by_path[note.path].get("error"),
+            }
+            for line, note in batch
+        ]
+
+    @staticmethod
+    def _error(line: int, path: str, error: str) -> Dict[str, Any]:
+        return {"line": line, "path": path, "status": "error", "insight_id": "", "error": error}
+
+    def summary(self) -> Dict[str, Any]:
+        """Return record counts per status, and the error that ended reading early."""
+        return {
+            "records": self.records,
+            "indexed": self.counts["indexed"],
+            "unchanged": self.counts["unchanged"],
+            "needs_content": self.counts["needs_content"],
+            "failed": self.counts["error"],
+            "error": self.error,
+        }
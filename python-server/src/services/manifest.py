@@ -0,0 +1,78 @@
+"""Compare a client's note manifest against the index."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .chroma_store import ChromaStore
+
+# Tolerance when comparing timestamps, since clients may report file
+# times with millisecond precision only
+TIMESTAMP_TOLERANCE = 1e-3
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse an ISO 8601 timestamp to epoch seconds, or None if invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _same_timestamp(client: Optional[str], stored: Optional[str]) -> bool:
+    client_time, stored_time = _parse_timestamp(client), _parse_timestamp(stored)
+    if client_time is None or stored_time is None:
+        return False
+    return abs(client_time - stored_time) < TIMESTAMP_TOLERANCE
+
+
+def diff_manifest(
+    chroma_store: ChromaStore,
+    entries: List[Dict[str, Any]],
+    prefix: str = "",
+) -> Dict[str, Any]:
+    """
+    Work out which notes a client has to send and which to delete.
+
+    A client note is sent when the index does not hold it, or holds a
+    different version: its content_hash differs when the client gave one,
+    otherwise its modified_at differs. Notes indexed by another embedding
+    model or index version are always sent, to be re-embedded. Indexed notes under prefix that
+    are missing from the client's manifest are to be deleted.
+
+    Args:
+        chroma_store: Index to compare against
+        entries: Dicts with 'path' and optional 'content_hash' and
+            'modified_at' keys, one per note the client has
+        prefix: Only indexed paths under this prefix are considered for
+            deletion
+
+    Returns:
+        Dict with sorted 'send' and 'delete' path lists and an
+        'unchanged' count
+    """
+    stored = {entry["path"]: entry for entry in chroma_store.manifest()}
+    client_paths = set()
+    send = set()
+
+    for entry in entries:
+        path = entry["path"]
+        client_paths.add(path)
+        current = stored.get(path)
+        if current is None or chroma_store.is_stale(path):
+            send.add(path)
+        elif entry.get("content_hash"):
+            if entry["content_hash"] != current["content_hash"]:
+                send.add(path)
+        elif not _same_timestamp(entry.get("modified_at"), current["modified_at"]):
+            send.add(path)
+
+    return {
+        "send": sorted(send),
+        "delete": sorted(
+            path for path in stored
+            if path.startswith(prefix) and path not in client_paths
+        ),
+        "unchanged": len(client_paths) - len(send),
+    }
@@ -0,0 +1,36 @@
+"""Lightweight in-process latency metrics."""
+
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyStats:
+    """Count, mean, max and recent percentiles of operation latencies."""
+
+    def __init__(self, window: int = 512):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def _percentile(self, fraction: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> Dict[str, float]:
+        """Summary in milliseconds; percentiles cover recent samples only."""
+        return {
+            "count": self.count,
+            "avg_ms": round(1000 * self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(1000 * self._percentile(0.5), 3),
+            "p95_ms": round(1000 * self._percentile(0.95), 3),
+            "max_ms": round(1000 * self.max, 3),
+        }
@@ -1,34 +1,344 @@
 """Markdown note parsing with frontmatter extraction."""
 
 import frontmatter
+from frontmatter.default_handlers import YAMLHandler
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Iterator, Optional
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
+import datetime
+import hashlib
 import logging
+import multiprocessing
+import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# Below this many files, shipping notes to and from even a warm pool
+# costs more than it saves (see benchmarks/parse_pool_bench.py)
+PROCESS_POOL_MIN_FILES = 4096
+
+
+# Same boundary python-frontmatter uses for YAML frontmatter
+_FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+# Indented lines other than list items, block scalars, anchors, tags and
+# flow mappings: frontmatter only the full YAML parser handles
+_COMPLEX_RE = re.compile(r"^[ ]+(?!-(?:[ ]|$))\S|:[ ]+[|>&*!{]", re.MULTILINE)
+_KEY_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*))?$")
+_INT_RE = re.compile(r"^[-+]?(?:0|[1-9][0-9]*)$")
+_FLOAT_RE = re.compile(r"^[-+]?[0-9]+\.[0-9]+$")
+_DATE_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})$")
+# Plain scalars starting like a number or date but not matched above may
+# be octal, sexagesimal, timestamps etc.; leave those to YAML
+_NUMERIC_LIKE_RE = re.compile(r"^[-+.]?[0-9]")
+
+_NULLS = {"", "~", "null", "Null", "NULL"}
+_BOOLS = {
+    "yes": True, "Yes": True, "YES": True,
+    "no": False, "No": False, "NO": False,
+    "true": True, "True": True, "TRUE": True,
+    "false": False, "False": False, "FALSE": False,
+    "on": True, "On": True, "ON": True,
+    "off": False, "Off": False, "OFF": False,
+}
+_YAML_HANDLER = YAMLHandler()
+_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`.=<")
+
+
+class _Unsupported(Exception):
+    """Frontmatter outside what the fast path handles."""
+
+
+def _parse_scalar(value: str) -> Any:
+    """Resolve a flow scalar the way YAML's SafeLoader would."""
+    if value.startswith('"'):
+        inner = value[1:-1]
+        if len(value) < 2 or not value.endswith('"') or '"' in inner or "\\" in inner:
+            raise _Unsupported(value)
+        return inner
+    if value.startswith("'"):
+        inner = value[1:-1]
+        if len(value) < 2 or not value.endswith("'") or "'" in inner.replace("''", ""):
+            raise _Unsupported(value)
+        return inner.replace("''", "'")
+
+    if value in _NULLS:
+        return None
+    if value in _BOOLS:
+        return _BOOLS[value]
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
+    date = _DATE_RE.match(value)
+    if date:
+        try:
+            return datetime.date(*(int(part) for part in date.groups()))
+        except ValueError:
+            raise _Unsupported(value)
+    if (
+        _NUMERIC_LIKE_RE.match(value)
+        or value[0] in _INDICATORS
+        or ": " in value
+        or " #" in value
+        or value.endswith(":")
+    ):
+        raise _Unsupported(value)
+    return value
+
+
+def _parse_flow_list(value: str) -> List[Any]:
+    """Parse a one-line flow sequence of scalars, e.g. [a, "[[b]]"]."""
+    inner = value[1:-1].strip()
+    items: List[Any] = []
+    pos = 0
+    while pos < len(inner):
+        if inner[pos] in "\"'":
+            # Quoted item, which may contain brackets and commas
+            end = inner.find(inner[pos], pos + 1)
+            while end != -1 and inner[pos] == "'" and inner.startswith("''", end):
+                end = inner.find("'", end + 2)
+            if end == -1:
+                raise _Unsupported(value)
+            item = inner[pos:end + 1]
+            pos = end + 1
+            rest = inner[pos:].lstrip(" ")
+            if rest and not rest.startswith(","):
+                raise _Unsupported(value)
+            pos = len(inner) - len(rest) + 1
+        else:
+            end = inner.find(",", pos)
+            if end == -1:
+                end = len(inner)
+            item = inner[pos:end].strip()
+            if not item or any(char in item for char in "[]{}"):
+                raise _Unsupported(value)
+            pos = end + 1
+        items.append(_parse_scalar(item))
+        if pos < len(inner):
+            pos += len(inner[pos:]) - len(inner[pos:].lstrip(" "))
+            if pos >= len(inner):
+                # Trailing comma
+                raise _Unsupported(value)
+    return items
+
+
+def _parse_value(value: str) -> Any:
+    if value.startswith("["):
+        if not value.endswith("]"):
+            raise _Unsupported(value)
+        return _parse_flow_list(value)
+    return _parse_scalar(value)
+
+
+def _parse_simple_frontmatter(block: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse flat frontmatter: 'key: value' lines whose values are scalars,
+    one-line [lists], or '- item' lists on the following lines.
+
+    Returns:
+        The metadata, or None if the block needs a full YAML parser
+    """
+    if _COMPLEX_RE.search(block):
+        return None
+
+    metadata: Dict[str, Any] = {}
+    list_key: Optional[str] = None
+    list_indent: Optional[int] = None
+
+    try:
+        for line in block.split("\n"):
+            line = line.rstrip("\r").rstrip(" ")
+            if "\t" in line or "\r" in line:
+                raise _Unsupported(line)
+            stripped = line.lstrip(" ")
+            if not stripped or stripped.startswith("#"):
+                continue
+
+            if stripped == "-" or stripped.startswith("- "):
+                # Block sequence item under the last empty-valued key
+                indent = len(line) - len(stripped)
+                if list_indent is None:
+                    list_indent = indent
+                if list_key is None or indent != list_indent:
+                    raise _Unsupported(line)
+                item = stripped[2:].strip()
+                if item.startswith(("[", "- ")) or (item and item[-1] == ":") or ": " in item:
+                    raise _Unsupported(line)
+                if metadata[list_key] is None:
+                    metadata[list_key] = []
+                metadata[list_key].append(_parse_scalar(item))
+                continue
+
+            match = _KEY_RE.match(line)
+            if not match or match.group(1) in _NULLS or match.group(1) in _BOOLS:
+                raise _Unsupported(line)
+            key, value = match.group(1), (match.group(2) or "").strip()
+            metadata[key] = _parse_value(value) if value else None
+            list_key = key if not value else None
+            list_indent = None
+    except _Unsupported:
+        return None
+
+    return metadata
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Split a note into frontmatter metadata and content.
+
+    Gives the same result as python-frontmatter, but flat key/value and
+    simple list frontmatter (as in the Insight template) is read with a
+    hand-written scanner; anything else goes through the full YAML parser.
+
+    Returns:
+        (metadata, content) tuple
+    """
+    # python-frontmatter turns CRLF into LF before parsing
+    text = text.replace("\r\n", "\n").strip()
+    if not _FM_BOUNDARY.match(text):
+        # No YAML frontmatter; python-frontmatter also detects JSON and TOML
+        post = frontmatter.loads(text)
+        return dict(post.metadata), post.content
+
+    parts = _FM_BOUNDARY.split(text, 2)
+    if len(parts) != 3:
+        return {}, text
+
+    metadata = _parse_simple_frontmatter(parts[1])
+    if metadata is None:
+        loaded = _YAML_HANDLER.load(parts[1])
+        metadata = dict(loaded) if isinstance(loaded, dict) else {}
+        if any(not isinstance(key, str) for key in metadata):
+            # python-frontmatter fails on these too (they become kwargs)
+            raise TypeError("Frontmatter keys must be strings")
+    return metadata, parts[2].strip()
+
 
 def parse_note(file_path: Path) -> Dict[str, Any]:
     """
     Parse a markdown note file.
 
     Returns:
-        Dict with 'content', 'frontmatter', and 'raw' keys
+        Dict with 'content', 'frontmatter', 'raw', 'mtime' and 'size' keys
     """
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+            metadata, content = parse_frontmatter(f.read())
+            stat = os.fstat(f.fileno())
 
         return {
-            "content": post.content,
-            "frontmatter": dict(post.metadata),
-            "raw": post.content,
+            "content": content,
+            "frontmatter": metadata,
+            "raw": content,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
         }
     except Exception as e:
         logger.error(f"Failed to parse note {file_path}: {e}")
         raise
 
 
+def _parse_many(
+    file_paths: List[str],
+) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse a chunk of notes, returning (path, parsed, error) for each."""
+    results = []
+    for file_path in file_paths:
+        try:
+            parsed = parse_note(Path(file_path))
+            results.append((file_path, parsed, None))
+        except Exception as e:
+            results.append((file_path, None, str(e)))
+    return results
+
+
+def create_parse_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for parse_notes_parallel.
+
+    Worker processes are started on first use and each pays for importing
+    this module, so callers should keep one pool for their lifetime
+    rather than create one per batch of files.
+    """
+    # Spawn rather than fork: the server process runs threads
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+async def parse_notes_parallel(
+    files: List[Path],
+    pool: Optional[ProcessPoolExecutor] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 32,
+) -> AsyncIterator[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse many notes in a process pool, yielding them in input order.
+
+    Files are sent to the pool in chunks of chunk_size; at most two
+    chunks per worker are in flight, so parsing runs only a little ahead
+    of the consumer. Without a pool, or for small sets, notes are parsed
+    in a thread instead.
+
+    Args:
+        files: Note files to parse
+        pool: Pool from create_parse_pool, owned by the caller
+        workers: Worker count of the pool (default: CPU count)
+
+    Yields:
+        (file path, parsed note or None, error message or None)
+    """
+    if pool is None or len(files) < PROCESS_POOL_MIN_FILES:
+        for start in range(0, len(files), chunk_size):
+            chunk = [str(file_path) for file_path in files[start:start + chunk_size]]
+            for file_path, parsed, error in await asyncio.to_thread(_parse_many, chunk):
+                yield Path(file_path), parsed, error
+        return
+
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    chunks = iter([
+        [str(file_path) for file_path in files[start:start + chunk_size]]
+        for start in range(0, len(files), chunk_size)
+    ])
+    pending: deque = deque()
+
+    def submit_next():
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(loop.run_in_executor(pool, _parse_many, chunk))
+
+    try:
+        for _ in range(workers * 2):
+            submit_next()
+        while pending:
+            results = await pending.popleft()
+            submit_next()
+            for file_path, parsed, error in results:
+                yield Path(file_path), parsed, error
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def canonical_body(content: str) -> str:
+    """
+    Note body as it is fingerprinted and stored: line endings normalized
+    and surrounding whitespace stripped, as parse_frontmatter returns it
+    for a file read from disk. The Obsidian plugin hashes the same form.
+    """
+    return content.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def compute_content_hash(content: str) -> str:
+    """Fingerprint note content (SHA-256 hex of the UTF-8 body)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 def get_relative_path(file_path: Path, vault_path: Path) -> str:
     """Get relative path from vault root."""
     try:
@@ -75,7 +385,7 @@ def parse_insights_folder(
     Parse all Insight notes in the Insights folder.
 
     Yields:
-        Dict with 'path', 'content', and 'frontmatter' keys
+        Dict with 'path', 'content', 'frontmatter', 'mtime' and 'size' keys
     """
     if not insights_folder.exists():
         logger.warning(f"Insights folder not found: {insights_folder}")
@@ -88,28 +398,63 @@ def parse_insights_folder(
                 "path": get_relative_path(file_path, vault_path),
                 "content": parsed["content"],
                 "frontmatter": parsed["frontmatter"],
+                "mtime": parsed["mtime"],
+                "size": parsed["size"],
             }
         except Exception as e:
             logger.error(f"Skipping {file_path}: {e}")
             continue
 
 
+# Bump when normalize_content output changes, so that notes indexed with
+# the previous normalization are re-embedded
+NORMALIZE_VERSION = 2
+
+# Each pattern starts with a fixed character so the regex engine can skip
+# ahead to candidates instead of trying every position. Fence lines and
+# heading markers are matched after a line break; normalize_content
+# prepends one so the first line is covered too.
+_BLOCK_RE = re.compile(r"\n[ \t]*(?:(?:```|~~~)[^\n]*|#{1,6}(?=[ \t\n]))")
+_EMBED_RE = re.compile(r"!\[\[([^\]|]+)(?:\|([^\]]+))?\]\]")
+_IMAGE_RE = re.compile(r"!\[([^\]\n]*)\]\([^)\n]*\)")
+_LINK_RE = re.compile(r"\[(?:\[([^\]|]+)(?:\|([^\]]+))?\]\]|([^\]\n]*)\]\([^)\n]*\))")
+_ATTACHMENT_RE = re.compile(r"\.(?!md$)[A-Za-z0-9]+$")
+
+
+def _embed_text(match: "re.Match[str]") -> str:
+    """Alias or target of an embed; embedded attachments carry no text."""
+    target, alias = match.groups()
+    if alias:
+        return alias
+    return "" if _ATTACHMENT_RE.search(target.strip()) else target
+
+
+def _link_text(match: "re.Match[str]") -> str:
+    """Display text of a wiki link or markdown link."""
+    target, alias, label = match.groups()
+    if label is not None:
+        return label
+    return alias or target
+
+
 def normalize_content(content: str) -> str:
     """
     Normalize content for embedding.
 
+    - Drop code fence lines and heading markers
+    - Normalize Obsidian links and embeds to plain text, dropping
+      embedded attachments
+    - Reduce markdown links and images to their text
     - Strip excessive whitespace
-    - Normalize Obsidian links to plain text
-    """
-    import re
 
-    # Normalize whitespace
-    content = " ".join(content.split())
-
-    # Convert [[Link|Display]] to Display
-    content = re.sub(r"\[\[([^\]|]+)\|([^\]]+)\]\]", r"\2", content)
-
-    # Convert [[Link]] to Link
-    content = re.sub(r"\[\[([^\]]+)\]\]", r"\1", content)
-
-    return content.strip()
+    Passes whose syntax does not occur in the note are skipped.
+    """
+    content = "\n" + content
+    if "```" in content or "~~~" in content or "#" in content:
+        content = _BLOCK_RE.sub("\n", content)
+    if "[" in content:
+        if "![" in content:
+            content = _EMBED_RE.sub(_embed_text, content)
+            content = _IMAGE_RE.sub(r"\1", content)
+        content = _LINK_RE.sub(_link_text, content)
+    return " ".join(content.split())
@@ -1,7 +1,7 @@
 """AI-powered comparison question generator."""
 
 from openai import AsyncOpenAI
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 import logging
 import json
 
@@ -15,6 +15,103 @@ from ..prompts.comparison_questions import SYSTEM_PROMPT, build_user_prompt
 
 logger = logging.getLogger(__name__)
 
+NO_INSIGHTS_QUESTION = (
+    "No related Insights found. What new understanding are you seeking with this question?"
+)
+FAILED_QUESTION = "Failed to generate questions. Please try again."
+
+
+class QuestionStreamParser:
+    """
+    Pull complete items out of the "questions" array of a JSON object
+    that arrives in pieces.
+
+    feed() scans each new piece once, tracking nesting and strings, and
+    returns the items whose closing brace it has seen. Text before the
+    item being read is dropped, so the buffer stays at most one item long.
+    """
+
+    def __init__(self, key: str = "questions"):
+        self.key = key
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        # Last string seen directly inside the top-level object
+        self._last_key: Optional[str] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, piece: str) -> List[Dict[str, Any]]:
+        """Add the next piece of the document and return completed items."""
+        start = len(self._text)
+        self._text += piece
+        text = self._text
+        items = []
+
+        for i in range(start, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start:i]
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch == "{" or ch == "[":
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._last_key == self.key:
+                    self._in_array = True
+                elif ch == "{" and self._in_array and self._depth == 3:
+                    self._item_start = i
+            elif ch == "}" or ch == "]":
+                if ch == "}" and self._item_start is not None and self._depth == 3:
+                    try:
+                        item = json.loads(text[self._item_start:i + 1])
+                    except json.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        items.append(item)
+                    self._item_start = None
+                elif ch == "]" and self._in_array and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+
+        # Keep only the item or key string still being read
+        if self._item_start is not None:
+            keep = self._item_start
+        elif self._in_string and self._depth == 1:
+            keep = self._string_start
+        else:
+            keep = len(text)
+        self._text = text[keep:]
+        self._string_start -= keep
+        if self._item_start is not None:
+            self._item_start -= keep
+
+        return items
+
+
+def _to_question(item: Dict[str, Any]) -> ComparisonQuestion:
+    """Build a ComparisonQuestion from a parsed model output item."""
+    try:
+        qtype = QuestionType(item.get("type", "amplify"))
+    except ValueError:
+        qtype = QuestionType.AMPLIFY
+
+    return ComparisonQuestion(
+        type=qtype,
+        insight_reference=item.get("insight_reference"),
+        quote=item.get("quote"),
+        question=item.get("question", ""),
+    )
+
 
 class QuestionGenerator:
     """Generate comparison questions using GPT-4."""
@@ -48,7 +145,7 @@ class QuestionGenerator:
                 questions=[
                     ComparisonQuestion(
                         type=QuestionType.AMPLIFY,
-                        question="No related Insights found. What new understanding are you seeking with this question?",
+                        question=NO_INSIGHTS_QUESTION,
                     )
                 ],
                 token_usage={"prompt": 0, "completion": 0},
@@ -73,20 +170,7 @@ class QuestionGenerator:
             content = response.choices[0].message.content
             parsed = json.loads(content)
 
-            questions = []
-            for q in parsed.get("questions", []):
-                question_type = q.get("type", "amplify")
-                try:
-                    qtype = QuestionType(question_type)
-                except ValueError:
-                    qtype = QuestionType.AMPLIFY
-
-                questions.append(ComparisonQuestion(
-                    type=qtype,
-                    insight_reference=q.get("insight_reference"),
-                    quote=q.get("quote"),
-                    question=q.get("question", ""),
-                ))
+            questions = [_to_question(q) for q in parsed.get("questions", [])]
 
             token_usage = {
                 "prompt": response.usage.prompt_tokens,
@@ -109,7 +193,7 @@ class QuestionGenerator:
                 questions=[
                     ComparisonQuestion(
                         type=QuestionType.AMPLIFY,
-                        question="Failed to generate questions. Please try again.",
+                        question=FAILED_QUESTION,
                     )
                 ],
                 token_usage={"prompt": 0, "completion": 0},
@@ -117,3 +201,86 @@ class QuestionGenerator:
         except Exception as e:
             logger.error(f"Question generation failed: {e}")
             raise
+
+    async def generate_stream(
+        self,
+        current_question: str,
+        retrieved_insights: List[RetrievedInsight],
+    ) -> AsyncIterator[Union[ComparisonQuestion, GenerateQuestionsResponse]]:
+        """
+        Generate comparison questions, yielding each one as soon as the
+        model has finished writing it.
+
+        Uses the streaming chat API and parses the "questions" array
+        incrementally. After the last question, yields the complete
+        GenerateQuestionsResponse with token usage.
+
+        Args:
+            current_question: The full content of the Question note
+            retrieved_insights: List of related Insights from RAG
+        """
+        if not retrieved_insights:
+            question = ComparisonQuestion(
+                type=QuestionType.AMPLIFY,
+                question=NO_INSIGHTS_QUESTION,
+            )
+            yield question
+            yield GenerateQuestionsResponse(
+                questions=[question],
+                token_usage={"prompt": 0, "completion": 0},
+            )
+            return
+
+        user_prompt = build_user_prompt(current_question, retrieved_insights)
+
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.7,
+            max_tokens=1500,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        parser = QuestionStreamParser()
+        questions: List[ComparisonQuestion] = []
+        token_usage = {"prompt": 0, "completion": 0}
+
+        async for chunk in stream:
+            if chunk.usage is not None:
+                token_usage = {
+                    "prompt": chunk.usage.prompt_tokens,
+                    "completion": chunk.usage.completion_tokens,
+                }
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for item in parser.feed(delta):
+                question = _to_question(item)
+                questions.append(question)
+                yield question
+
+        if not questions:
+            logger.error("No questions found in streamed GPT response")
+            question = ComparisonQuestion(
+                type=QuestionType.AMPLIFY,
+                question=FAILED_QUESTION,
+            )
+            questions.append(question)
+            yield question
+
+        logger.info(
+            f"Streamed {len(questions)} questions "
+            f"(tokens: {token_usage['prompt']} + {token_usage['completion']})"
+        )
+
+        yield GenerateQuestionsResponse(
+            questions=questions,
+            token_usage=token_usage,
+        )
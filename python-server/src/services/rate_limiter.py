@@ -0,0 +1,197 @@
+"""Rate-limit-aware scheduling for OpenAI API requests."""
+
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import logging
+import random
+import time
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount could be taken, without taking it."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    async def acquire(self, amount: float) -> float:
+        """
+        Take amount from the bucket, waiting for it to refill if needed.
+
+        Requests larger than the capacity are clamped so they can still run.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock makes waiters take turns in arrival order
+        async with self._lock:
+            while True:
+                delay = self.wait_time(amount)
+                if delay <= 0:
+                    self.level -= amount
+                    return waited
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the server's Retry-After hint from an API error, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Schedule API calls within requests-per-minute and tokens-per-minute
+    budgets, retrying rate-limited and transient failures.
+
+    Retries use jittered exponential backoff, or the server's Retry-After
+    hint when present. A 429 pauses every caller, not only the one that
+    received it, so bursts slow down instead of failing.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 3000,
+        tokens_per_minute: int = 1000000,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._paused_until = 0.0
+
+        self.request_count = 0
+        self.retry_count = 0
+        self.rate_limited_count = 0
+        self.failure_count = 0
+        self.throttled_seconds = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def wait_time(self) -> float:
+        """Seconds until a new request could start."""
+        paused = max(0.0, self._paused_until - time.monotonic())
+        return max(paused, self.requests.wait_time(1))
+
+    async def wait_until_ready(self):
+        """Wait, without consuming budget, until a request could start."""
+        while (delay := self.wait_time()) > 0:
+            await asyncio.sleep(delay)
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        Run an API call once budget allows, retrying retryable errors.
+
+        Args:
+            call: Zero-argument coroutine factory making the request
+            tokens: Tokens the request will consume
+
+        Returns:
+            The call's result
+        """
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            pause = self._paused_until - started
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await self.requests.acquire(1)
+            await self.tokens.acquire(tokens)
+            self.throttled_seconds += time.monotonic() - started
+
+            self.request_count += 1
+            try:
+                return await call()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self.failure_count += 1
+                    raise
+
+                retry_after = _retry_after_seconds(e)
+                delay = min(
+                    self.max_delay,
+                    retry_after if retry_after is not None else self._backoff(attempt),
+                )
+                if isinstance(e, openai.RateLimitError):
+                    self.rate_limited_count += 1
+                    self._paused_until = max(
+                        self._paused_until, time.monotonic() + delay
+                    )
+
+                self.retry_count += 1
+                logger.warning(
+                    f"{type(e).__name__} from OpenAI, retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return scheduler counters."""
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "rate_limited": self.rate_limited_count,
+            "failures": self.failure_count,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
@@ -0,0 +1,124 @@
+"""Startup reconciliation of the index against the Insights folder."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from .bulk_indexer import BulkIndexer
+from .chroma_store import ChromaStore
+from .note_parser import get_relative_path
+
+logger = logging.getLogger(__name__)
+
+
+def scan_insights(
+    insights_folder: Path, vault_path: Path
+) -> Tuple[Dict[str, Tuple[Path, float, int]], List[str]]:
+    """
+    Walk insights_folder with os.scandir, collecting note file stats.
+
+    Returns:
+        Tuple of a dict of relative path to (file path, mtime, size), and
+        the relative paths of subfolders that could not be read
+
+    Raises:
+        OSError: If insights_folder itself cannot be read
+    """
+    notes: Dict[str, Tuple[Path, float, int]] = {}
+    unreadable: List[str] = []
+    root = str(insights_folder)
+    stack = [root]
+
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        stat = entry.stat()
+                        file_path = Path(entry.path)
+                        notes[get_relative_path(file_path, vault_path)] = (
+                            file_path, stat.st_mtime, stat.st_size
+                        )
+        except OSError as e:
+            if folder == root:
+                raise
+            logger.warning(f"Cannot scan {e.filename}: {e}")
+            unreadable.append(get_relative_path(Path(folder), vault_path))
+
+    return notes, unreadable
+
+
+async def reconcile_insights(
+    chroma_store: ChromaStore,
+    bulk_indexer: BulkIndexer,
+    vault_path: Path,
+    delete_missing: bool = True,
+) -> Dict[str, Any]:
+    """
+    Bring the index up to date with changes made while nothing was watching.
+
+    Only notes whose mtime or size differ from the stored metadata are
+    parsed and indexed (and, of those, only notes whose content changed
+    are embedded); indexed notes missing from disk are deleted.
+
+    Nothing is deleted when delete_missing is False, when the scan finds
+    no notes at all while the index holds some (an unmounted or replaced
+    folder looks the same as one emptied on purpose), or under
+    subfolders that could not be read.
+
+    Raises:
+        OSError: If the Insights folder cannot be read
+
+    Returns:
+        Dict with 'scanned', 'changed', 'deleted', 'indexed_count',
+        'unchanged_count' and 'errors' keys
+    """
+    started = time.monotonic()
+    insights_folder = vault_path / "Insights"
+    on_disk, unreadable = await asyncio.to_thread(scan_insights, insights_folder, vault_path)
+
+    changed: List[Path] = [
+        file_path
+        for path, (file_path, mtime, size) in on_disk.items()
+        if not chroma_store.is_current(path, mtime, size)
+    ]
+    missing = [
+        path for path in chroma_store.indexed_paths()
+        if path.startswith("Insights/") and path not in on_disk
+        and not any(path.startswith(f"{folder}/") for folder in unreadable)
+    ]
+    if missing and not delete_missing:
+        missing = []
+    elif missing and not on_disk:
+        logger.warning(
+            f"No Insights found in {insights_folder}, keeping {len(missing)} "
+            f"indexed Insights; delete them explicitly if intended"
+        )
+        missing = []
+
+    deleted = await chroma_store.delete_many(missing) if missing else 0
+    result: Dict[str, Any] = {
+        "indexed_count": 0,
+        "unchanged_count": 0,
+        "errors": [],
+    }
+    if changed:
+        result = await bulk_indexer.index_files(sorted(changed), vault_path)
+
+    logger.info(
+        f"Reconciled {len(on_disk)} Insights in {time.monotonic() - started:.2f}s: "
+        f"{len(changed)} changed ({result['indexed_count']} re-indexed), "
+        f"{deleted} deleted"
+    )
+    return {
+        "scanned": len(on_disk),
+        "changed": len(changed),
+        "deleted": deleted,
+        **result,
+    }
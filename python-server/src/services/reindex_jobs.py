@@ -0,0 +1,154 @@
+"""Background reindex jobs with progress tracking."""
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+import logging
+import uuid
+
+from .bulk_indexer import BulkIndexer, IndexProgress
+from ..api.schemas import ReindexJobResponse, ReindexJobStatus, ReindexProgress
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = {
+    ReindexJobStatus.COMPLETED,
+    ReindexJobStatus.FAILED,
+    ReindexJobStatus.CANCELLED,
+}
+
+
+class ReindexJob:
+    """A single reindex run executing as an asyncio task."""
+
+    def __init__(self, vault_path: Path):
+        self.id = uuid.uuid4().hex
+        self.vault_path = vault_path
+        self.status = ReindexJobStatus.PENDING
+        self.progress = IndexProgress()
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    async def wait(self):
+        """Wait for the job to finish, without cancelling it if the waiter is."""
+        if self.task:
+            await asyncio.wait([self.task])
+
+    def to_response(self) -> ReindexJobResponse:
+        return ReindexJobResponse(
+            job_id=self.id,
+            vault_path=str(self.vault_path),
+            status=self.status,
+            progress=ReindexProgress(**self.progress.as_dict()),
+            errors=list(self.progress.errors),
+            error=self.error,
+            created_at=self.created_at.isoformat(),
+            finished_at=self.finished_at.isoformat() if self.finished_at else None,
+        )
+
+
+class ReindexJobManager:
+    """Start, track and cancel background reindex jobs."""
+
+    def __init__(self, bulk_indexer: BulkIndexer, max_finished_jobs: int = 20):
+        self.bulk_indexer = bulk_indexer
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: "OrderedDict[str, ReindexJob]" = OrderedDict()
+
+    def start(self, vault_path: Path) -> ReindexJob:
+        """
+        Start reindexing a vault in the background.
+
+        If a job for the same vault is already running, that job is
+        returned instead of starting a second one.
+        """
+        for job in self._jobs.values():
+            if job.vault_path == vault_path and not job.is_finished:
+                return job
+
+        job = ReindexJob(vault_path)
+        job.task = asyncio.create_task(self._run(job))
+        self._jobs[job.id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[ReindexJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[ReindexJob]:
+        """Request cancellation of a job."""
+        job = self._jobs.get(job_id)
+        if job and not job.is_finished and job.task:
+            job.task.cancel()
+        return job
+
+    async def events(
+        self,
+        job: ReindexJob,
+        interval: float = 0.5,
+    ) -> AsyncIterator[ReindexJobResponse]:
+        """Yield job snapshots whenever progress changes, until it finishes."""
+        last = None
+        while True:
+            snapshot = job.to_response()
+            progress = snapshot.progress
+            # Elapsed time and throughput always move; only emit real changes
+            key = (
+                snapshot.status,
+                progress.parsed,
+                progress.embedded,
+                progress.written,
+                progress.unchanged,
+                progress.failed,
+            )
+            if key != last:
+                last = key
+                yield snapshot
+            if job.is_finished:
+                return
+            await asyncio.sleep(interval)
+
+    async def shutdown(self):
+        """Cancel all running jobs."""
+        running = [
+            job.task for job in self._jobs.values()
+            if job.task and not job.is_finished
+        ]
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.wait(running)
+
+    async def _run(self, job: ReindexJob):
+        job.status = ReindexJobStatus.RUNNING
+        logger.info(f"Reindex job {job.id} started for {job.vault_path}")
+        try:
+            await self.bulk_indexer.index_folder(
+                job.vault_path / "Insights",
+                job.vault_path,
+                progress=job.progress,
+            )
+            job.status = ReindexJobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.status = ReindexJobStatus.CANCELLED
+            logger.info(f"Reindex job {job.id} cancelled")
+        except Exception as e:
+            job.status = ReindexJobStatus.FAILED
+            job.error = str(e)
+            logger.error(f"Reindex job {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
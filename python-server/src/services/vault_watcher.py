@@ -2,18 +2,54 @@
 
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
+from .bulk_indexer import BulkIndexer
 from .chroma_store import ChromaStore
-from .note_parser import parse_note, get_relative_path, is_insight_note
+from .debounce import DebounceScheduler
+from .index_queue import IndexWorkQueue
+from .note_parser import get_relative_path, is_insight_note
+from .reconciler import reconcile_insights
 
 logger = logging.getLogger(__name__)
 
-DEBOUNCE_SECONDS = 0.3
+class WatchEvent:
+    """
+    A pending index change for one file or folder.
+
+    kind is 'update', 'delete' or 'move'; moves carry the old path in
+    moved_from, and modified is set when the file also changed after
+    being moved.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        path: str,
+        is_directory: bool = False,
+        moved_from: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.path = path
+        self.is_directory = is_directory
+        self.moved_from = moved_from
+        self.modified = False
+
+
+def merge_events(old: WatchEvent, new: WatchEvent) -> WatchEvent:
+    """Merge two events for the same path, keeping a pending move's source."""
+    if old.kind == "move":
+        if new.kind == "delete":
+            # Moved, then deleted: the old path is what is in the index
+            return WatchEvent("delete", old.moved_from, old.is_directory)
+        if new.kind == "update":
+            old.modified = True
+            return old
+    return new
 
 
 class InsightEventHandler(FileSystemEventHandler):
@@ -22,49 +58,33 @@ class InsightEventHandler(FileSystemEventHandler):
     def __init__(
         self,
         vault_path: Path,
-        chroma_store: ChromaStore,
-        loop: asyncio.AbstractEventLoop,
+        scheduler: DebounceScheduler,
     ):
         super().__init__()
         self.vault_path = vault_path
-        self.chroma_store = chroma_store
-        self.loop = loop
-        self._pending_tasks: dict[str, asyncio.TimerHandle] = {}
-
-    def _schedule_update(self, path: str, is_delete: bool = False):
-        """Schedule a debounced update for a file."""
-        # Cancel any pending task for this path
-        if path in self._pending_tasks:
-            self._pending_tasks[path].cancel()
+        self.scheduler = scheduler
 
-        # Schedule new task
-        async def do_update():
-            try:
-                file_path = Path(path)
-                relative_path = get_relative_path(file_path, self.vault_path)
-
-                if is_delete:
-                    await self.chroma_store.delete(relative_path)
-                    logger.info(f"Removed from index: {relative_path}")
-                else:
-                    if file_path.exists():
-                        parsed = parse_note(file_path)
-                        await self.chroma_store.upsert(
-                            path=relative_path,
-                            content=parsed["content"],
-                            frontmatter=parsed["frontmatter"],
-                        )
-                        logger.info(f"Updated index: {relative_path}")
-            except Exception as e:
-                logger.error(f"Failed to process {path}: {e}")
-            finally:
-                self._pending_tasks.pop(path, None)
-
-        def run_update():
-            asyncio.run_coroutine_threadsafe(do_update(), self.loop)
-
-        handle = self.loop.call_later(DEBOUNCE_SECONDS, run_update)
-        self._pending_tasks[path] = handle
+    def _schedule_update(
+        self,
+        path: str,
+        is_delete: bool = False,
+        is_directory: bool = False,
+        moved_from: Optional[str] = None,
+    ):
+        """
+        Schedule a debounced update for a file or folder.
+
+        Runs on the observer thread; the scheduler moves the event onto
+        the event loop. moved_from is the old path of a renamed file or
+        folder, whose index records are re-keyed rather than re-embedded.
+        """
+        if moved_from is not None:
+            kind = "move"
+        elif is_delete:
+            kind = "delete"
+        else:
+            kind = "update"
+        self.scheduler.submit(path, WatchEvent(kind, path, is_directory, moved_from))
 
     def on_created(self, event: FileSystemEvent):
         """Handle file creation."""
@@ -87,30 +107,48 @@ class InsightEventHandler(FileSystemEventHandler):
             self._schedule_update(event.src_path)
 
     def on_deleted(self, event: FileSystemEvent):
-        """Handle file deletion."""
+        """Handle file or folder deletion."""
+        # Check if it was in Insights folder (can't check file anymore)
+        relative = event.src_path.replace(str(self.vault_path), "").lstrip("/\\")
         if event.is_directory:
+            if relative.startswith("Insights/"):
+                logger.debug(f"Insights folder deleted: {event.src_path}")
+                self._schedule_update(event.src_path, is_delete=True, is_directory=True)
             return
 
-        # Check if it was in Insights folder (can't check file anymore)
-        relative = event.src_path.replace(str(self.vault_path), "").lstrip("/\\")
         if relative.startswith("Insights/") and event.src_path.endswith(".md"):
             logger.debug(f"Insight deleted: {event.src_path}")
             self._schedule_update(event.src_path, is_delete=True)
 
     def on_moved(self, event: FileSystemEvent):
-        """Handle file move/rename."""
+        """Handle file or folder move/rename."""
+        src_relative = event.src_path.replace(str(self.vault_path), "").lstrip("/\\")
+        dest_relative = event.dest_path.replace(str(self.vault_path), "").lstrip("/\\")
+        src_is_insight = src_relative.startswith("Insights/")
+        dest_is_insight = dest_relative.startswith("Insights/")
+
         if event.is_directory:
+            if src_is_insight and dest_is_insight:
+                self._schedule_update(
+                    event.dest_path, is_directory=True, moved_from=event.src_path
+                )
+            elif src_is_insight:
+                self._schedule_update(event.src_path, is_delete=True, is_directory=True)
+            elif dest_is_insight:
+                for file_path in Path(event.dest_path).rglob("*.md"):
+                    if is_insight_note(file_path, self.vault_path):
+                        self._schedule_update(str(file_path))
             return
 
-        src_path = Path(event.src_path)
+        src_is_insight = src_is_insight and event.src_path.endswith(".md")
         dest_path = Path(event.dest_path)
 
-        # Handle as delete + create
-        src_relative = event.src_path.replace(str(self.vault_path), "").lstrip("/\\")
-        if src_relative.startswith("Insights/") and event.src_path.endswith(".md"):
+        if src_is_insight and is_insight_note(dest_path, self.vault_path):
+            # Rename: reuse the stored embedding
+            self._schedule_update(event.dest_path, moved_from=event.src_path)
+        elif src_is_insight:
             self._schedule_update(event.src_path, is_delete=True)
-
-        if is_insight_note(dest_path, self.vault_path):
+        elif is_insight_note(dest_path, self.vault_path):
             self._schedule_update(event.dest_path)
 
 
@@ -121,11 +159,28 @@ class VaultWatcher:
         self,
         vault_path: str,
         chroma_store: ChromaStore,
+        bulk_indexer: Optional[BulkIndexer] = None,
+        reconcile_on_start: bool = True,
+        quiet_period: float = 0.3,
+        max_latency: float = 2.0,
+        workers: int = 2,
+        max_queued: int = 1000,
     ):
         self.vault_path = Path(vault_path).resolve()
         self.chroma_store = chroma_store
+        # Close only an indexer of our own; a shared one belongs to the app
+        self._owns_bulk_indexer = bulk_indexer is None
+        self.bulk_indexer = bulk_indexer or BulkIndexer(chroma_store)
+        self.reconcile_on_start = reconcile_on_start
+        self.quiet_period = quiet_period
+        self.max_latency = max_latency
+        self.workers = workers
+        self.max_queued = max_queued
         self.observer: Optional[Observer] = None
+        self.scheduler: Optional[DebounceScheduler] = None
+        self.index_queue: Optional[IndexWorkQueue] = None
         self._running = False
+        self._reconcile_task: Optional[asyncio.Task] = None
 
     @property
     def is_running(self) -> bool:
@@ -139,15 +194,30 @@ class VaultWatcher:
             return
 
         insights_path = self.vault_path / "Insights"
-        if not insights_path.exists():
+        created = not insights_path.exists()
+        if created:
             insights_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created Insights folder: {insights_path}")
 
-        loop = asyncio.get_event_loop()
+        self.index_queue = IndexWorkQueue(
+            chroma_store=self.chroma_store,
+            vault_path=self.vault_path,
+            workers=self.workers,
+            max_queued=self.max_queued,
+            batch_size=self.bulk_indexer.batch_size,
+        )
+        self.index_queue.start()
+
+        self.scheduler = DebounceScheduler(
+            loop=asyncio.get_running_loop(),
+            flush=self._process_events,
+            quiet_period=self.quiet_period,
+            max_latency=self.max_latency,
+            merge=merge_events,
+        )
         handler = InsightEventHandler(
             vault_path=self.vault_path,
-            chroma_store=self.chroma_store,
-            loop=loop,
+            scheduler=self.scheduler,
         )
 
         self.observer = Observer()
@@ -161,8 +231,83 @@ class VaultWatcher:
 
         logger.info(f"Started watching: {insights_path}")
 
+        # Catch up on edits made while the server was down; events arriving
+        # meanwhile are handled by the observer as usual
+        if self.reconcile_on_start:
+            # A folder that was missing says nothing about the notes in
+            # the index, so only pick up new files in that case
+            self._reconcile_task = asyncio.create_task(
+                self._reconcile(delete_missing=not created)
+            )
+
+    def _relative(self, path: str) -> str:
+        return get_relative_path(Path(path), self.vault_path)
+
+    async def _process_events(self, events: Dict[str, WatchEvent]):
+        """Apply a debounced batch of changes: moves, then deletes, then updates."""
+        file_moves: List[Tuple[str, str]] = []
+        moved_events: List[WatchEvent] = []
+        deleted_paths: List[str] = []
+        updated_files: List[Path] = []
+
+        for event in events.values():
+            if event.kind == "move" and event.is_directory:
+                await self.chroma_store.move_prefix(
+                    self._relative(event.moved_from), self._relative(event.path)
+                )
+            elif event.kind == "move":
+                file_moves.append((self._relative(event.moved_from), self._relative(event.path)))
+                moved_events.append(event)
+            elif event.kind == "delete" and event.is_directory:
+                await self.chroma_store.delete_prefix(self._relative(event.path))
+            elif event.kind == "delete":
+                deleted_paths.append(self._relative(event.path))
+            elif event.kind == "update":
+                updated_files.append(Path(event.path))
+
+        if file_moves:
+            await self.chroma_store.move_many(file_moves)
+            # Index from the file when the old path was not indexed, or
+            # the note was also edited after the move
+            for event in moved_events:
+                if event.modified or not self.chroma_store.is_indexed(self._relative(event.path)):
+                    updated_files.append(Path(event.path))
+
+        if deleted_paths:
+            await self.chroma_store.delete_many(deleted_paths)
+
+        updated_files = [file_path for file_path in updated_files if file_path.exists()]
+        # Blocks while the work queue is full, holding further events in
+        # the scheduler where they keep coalescing
+        for file_path in sorted(updated_files):
+            await self.index_queue.put(file_path)
+
+        logger.info(
+            f"Processed {len(events)} vault changes: {len(file_moves)} moved, "
+            f"{len(deleted_paths)} deleted, {len(updated_files)} queued for indexing"
+        )
+
+    async def _reconcile(self, delete_missing: bool = True):
+        try:
+            await reconcile_insights(
+                self.chroma_store, self.bulk_indexer, self.vault_path,
+                delete_missing=delete_missing,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Startup reconciliation failed: {e}")
+
     async def stop(self):
         """Stop watching the vault."""
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
         if self.observer:
             self.observer.stop()
             self.observer.join(timeout=5)
@@ -170,6 +315,29 @@ class VaultWatcher:
             self._running = False
             logger.info("Vault watcher stopped")
 
+        if self.scheduler is not None:
+            # Apply changes seen before the observer stopped
+            await self.scheduler.close()
+            self.scheduler = None
+
+        if self.index_queue is not None:
+            await self.index_queue.stop()
+            self.index_queue = None
+
+        if self._owns_bulk_indexer:
+            self.bulk_indexer.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Return debounce and indexing queue counters."""
+        stats: Dict[str, float] = {}
+        if self.scheduler is not None:
+            scheduler_stats = self.scheduler.stats()
+            stats["events_pending"] = scheduler_stats.pop("pending")
+            stats.update(scheduler_stats)
+        if self.index_queue is not None:
+            stats.update(self.index_queue.stats())
+        return stats
+
     async def restart(self, new_vault_path: Optional[str] = None):
         """Restart the watcher, optionally with a new vault path."""
         await self.stop()
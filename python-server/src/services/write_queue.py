@@ -0,0 +1,153 @@
+"""Single-writer queue batching ChromaDB writes."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WriteOp:
+    """
+    A pending write for one note path.
+
+    kind is 'upsert' (records holds ids, embeddings, documents and
+    metadatas of every chunk), 'touch' (metadata holds updated note
+    metadata to apply to the stored chunks, or None to keep the stored
+    state as is) or 'delete'.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        path: str,
+        doc_id: str,
+        records: Optional[Dict[str, List[Any]]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.kind = kind
+        self.path = path
+        self.doc_id = doc_id
+        self.records = records
+        self.metadata = metadata
+        self.result: Dict[str, Any] = {"path": path, "id": doc_id, "status": kind}
+        self.futures: List[asyncio.Future] = []
+
+
+class WriteQueue:
+    """
+    Collect writes and apply them in batches from a single writer.
+
+    Operations on the same path collapse: the latest one wins, and callers
+    waiting on superseded operations receive its result. Pending operations
+    are flushed when max_batch paths are queued or flush_interval seconds
+    after the first one arrived, whichever is first. Only one flush runs at
+    a time, so readers see the index change one whole batch at a time.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[WriteOp]], Awaitable[None]],
+        max_batch: int = 256,
+        flush_interval: float = 0.05,
+    ):
+        self.apply_batch = apply_batch
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, WriteOp] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        self.flush_count = 0
+        self.ops_written = 0
+        self.ops_superseded = 0
+
+    def has_pending(self, path: str) -> bool:
+        """Check whether a write for path is waiting to be flushed."""
+        return path in self._pending
+
+    def pending_paths(self, prefix: str = "") -> List[str]:
+        """Paths with a queued write, optionally under a prefix."""
+        return [path for path in self._pending if path.startswith(prefix)]
+
+    async def submit(self, ops: List[WriteOp]) -> List[Dict[str, Any]]:
+        """Queue operations and wait until they have been written."""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for op in ops:
+            previous = self._pending.pop(op.path, None)
+            if previous is not None:
+                op.futures.extend(previous.futures)
+                self.ops_superseded += 1
+            future = loop.create_future()
+            op.futures.append(future)
+            futures.append(future)
+            self._pending[op.path] = op
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None and self._pending:
+            self._timer = loop.call_later(self.flush_interval, self._start_flush)
+
+        return list(await asyncio.gather(*futures))
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """Write everything queued so far."""
+        async with self._lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self):
+        while self._pending:
+            ops = list(self._pending.values())[:self.max_batch]
+            for op in ops:
+                del self._pending[op.path]
+
+            try:
+                await self.apply_batch(ops)
+            except Exception as e:
+                logger.error(f"Failed to write batch of {len(ops)} operations: {e}")
+                for op in ops:
+                    for future in op.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                continue
+
+            self.flush_count += 1
+            self.ops_written += len(ops)
+            for op in ops:
+                for future in op.futures:
+                    if not future.done():
+                        future.set_result(op.result)
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """Flush pending writes, then hold off other writes for the block."""
+        async with self._lock:
+            await self._flush_locked()
+            yield
+
+    async def close(self):
+        """Flush remaining writes."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue counters."""
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flush_count,
+            "ops_written": self.ops_written,
+            "ops_superseded": self.ops_superseded,
+        }
@@ -0,0 +1,42 @@
+"""Tests that chunks stay within the token budget."""
+
+from src.services.chunker import chunk_note
+
+
+class ByteEncoding:
+    """
+    Byte-level tokens, so that a CJK or Hangul character takes three, as
+    with cl100k, and a slice can cut through one.
+    """
+
+    def encode(self, text, disallowed_special=()):
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+
+def test_short_cjk_note_is_split_by_tokens():
+    encoding = ByteEncoding()
+    content = "한국어 문장입니다. " * 20
+
+    chunks = chunk_note(content, encoding, max_tokens=len(content), overlap_tokens=20)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(encoding.encode(chunk)) <= len(content)
+        assert "\ufffd" not in chunk
+
+
+def test_heading_and_overlap_count_against_the_budget():
+    encoding = ByteEncoding()
+    paragraphs = [f"paragraph {i} " + "漢字 word " * 12 for i in range(12)]
+    content = "## A fairly long section heading\n\n" + "\n\n".join(paragraphs)
+
+    chunks = chunk_note(content, encoding, max_tokens=200, overlap_tokens=60)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(encoding.encode(chunk)) <= 200
+        assert "\ufffd" not in chunk
+    assert all(chunk.startswith("## A fairly long section heading") for chunk in chunks)
@@ -0,0 +1,112 @@
+"""Tests that the plugin and the server fingerprint a note body alike."""
+
+import asyncio
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.services.chroma_store import ChromaStore
+from src.services.chunker import ApproximateEncoding
+from src.services.note_parser import canonical_body, compute_content_hash, parse_note
+
+PLUGIN_DIR = Path(__file__).resolve().parents[2] / "obsidian-plugin"
+ESBUILD = PLUGIN_DIR / "node_modules" / ".bin" / "esbuild"
+
+# File contents as written by Obsidian or other editors
+NOTES = {
+    "blank_line_after_frontmatter": "---\ntitle: a\n---\n\nhello\n",
+    "no_blank_line": "---\ntype: insight\n---\nhello\nworld",
+    "trailing_whitespace": "---\ntype: insight\n---\n\n  hello  \n\n\n",
+    "crlf": "---\r\ntype: insight\r\n---\r\n\r\nhello\r\nworld\r\n",
+    "long_boundaries": "---- \ntype: insight\n-----\nhello\n",
+    "empty_frontmatter": "---\n---\nhello\n",
+    "leading_blank_lines": "\n\n---\ntype: insight\n---\nhello\n",
+    "no_frontmatter": "\nhello\n\n---\nnot frontmatter\n",
+    "unclosed_frontmatter": "---\ntype: insight\nhello\n",
+    "unicode_whitespace": "---\ntype: insight\n---\n　hello  world \n",
+    "rule_in_body": "---\ntype: insight\n---\nabove\n\n---\n\nbelow\n",
+}
+
+
+def server_hash(tmp_path: Path, name: str, text: str) -> str:
+    """Fingerprint of the note as the server computes it when indexing the file."""
+    file_path = tmp_path / f"{name}.md"
+    file_path.write_bytes(text.encode("utf-8"))
+    return compute_content_hash(parse_note(file_path)["content"])
+
+
+def test_bodies_read_from_disk_are_canonical(tmp_path):
+    for name, text in NOTES.items():
+        file_path = tmp_path / f"{name}.md"
+        file_path.write_bytes(text.encode("utf-8"))
+        body = parse_note(file_path)["content"]
+        assert canonical_body(body) == body, name
+
+
+def test_uploaded_body_is_stored_under_the_disk_hash(tmp_path):
+    store = ChromaStore(str(tmp_path / "chroma"), "test", embedding_cache_size=0)
+
+    async def embed_texts(texts, token_lists=None):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    backend = store.embedding_service.backend
+    backend.embed_texts = embed_texts
+    # No tiktoken download
+    backend._encoding = ApproximateEncoding()
+    try:
+        # Body as a client splits it off, with blank lines and CRLF kept
+        results = asyncio.run(store.upsert_many([{
+            "path": "Insights/a.md",
+            "content": "\r\nhello\r\nworld\r\n",
+            "frontmatter": {},
+        }]))
+        assert results[0]["status"] == "indexed"
+        stored = store._notes["Insights/a.md"]
+        assert stored["content_hash"] == compute_content_hash("hello\nworld")
+
+        # A hash-only offer of the canonical body now matches
+        results = asyncio.run(store.upsert_many([{
+            "path": "Insights/a.md",
+            "content_hash": compute_content_hash("hello\nworld"),
+            "frontmatter": {},
+        }]))
+        assert results[0]["status"] == "unchanged"
+    finally:
+        store.close()
+
+
+@pytest.mark.skipif(
+    not ESBUILD.exists() or shutil.which("node") is None,
+    reason="needs node and the plugin's dev dependencies (npm install)",
+)
+def test_plugin_hash_matches_server(tmp_path):
+    entry = tmp_path / "entry.ts"
+    entry.write_text(
+        f"import {{ parseFrontmatter }} from {json.dumps(str(PLUGIN_DIR / 'src/services/note-classifier'))};\n"
+        f"import {{ hashContent }} from {json.dumps(str(PLUGIN_DIR / 'src/services/content-hash'))};\n"
+        "const notes: Record<string, string> = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n"
+        "(async () => {\n"
+        "  const hashes: Record<string, string> = {};\n"
+        "  for (const [name, text] of Object.entries(notes)) {\n"
+        "    hashes[name] = await hashContent(parseFrontmatter(text).body);\n"
+        "  }\n"
+        "  console.log(JSON.stringify(hashes));\n"
+        "})();\n"
+    )
+    bundle = tmp_path / "bundle.js"
+    subprocess.run(
+        [str(ESBUILD), str(entry), "--bundle", "--platform=node",
+         "--external:obsidian", f"--outfile={bundle}"],
+        check=True, capture_output=True,
+    )
+    output = subprocess.run(
+        ["node", str(bundle)],
+        input=json.dumps(NOTES), check=True, capture_output=True, text=True,
+    ).stdout
+
+    plugin_hashes = json.loads(output)
+    for name, text in NOTES.items():
+        assert plugin_hashes[name] == server_hash(tmp_path, name, text), name
@@ -0,0 +1,117 @@
+"""Tests that the fast frontmatter parser agrees with python-frontmatter."""
+
+import frontmatter
+import pytest
+
+from src.services.note_parser import _parse_simple_frontmatter, parse_frontmatter
+
+# Frontmatter blocks the hand-written scanner reads itself
+FAST = {
+    "insight_template": (
+        "type: insight\n"
+        "created: 2025-01-03\n"
+        "confidence: medium\n"
+        "source_questions: [\"[[question-1]]\", \"[[question-2]]\"]\n"
+        "evolved_from: null\n"
+        "tags: [learning, embodiment]"
+    ),
+    "double_quoted": 'title: "Hello, world: # not a comment"',
+    "single_quoted_escape": "title: 'it''s [[here]]'",
+    "quoted_numbers": "a: \"42\"\nb: '2025-01-03'\nc: \"yes\"",
+    "dates": "created: 2025-01-03\nupdated: 1999-12-31",
+    "nulls": "a: ~\nb: null\nc:\nd: NULL\ne: Null",
+    "bools": "a: yes\nb: No\nc: TRUE\nd: off\ne: On\nf: false",
+    "numbers": "a: 42\nb: -7\nc: +3\nd: 0\ne: 3.14\nf: -0.5",
+    "plain_strings": "url: https://example.com/a\nname: Hello world\nmark: a#b",
+    "flow_list": "tags: [learning, \"a, b\", 'c''d', 1, 2.5, null, yes, 2025-01-03]",
+    "empty_flow_list": "related: []",
+    "trailing_comma": "tags: [a, b,]",
+    "block_list": "source:\n  - \"[[question-1]]\"\n  - plain\n  - 3\n  -",
+    "unindented_block_list": "source:\n- a\n- b\ntags: [x]",
+    "comments": "# leading comment\ntype: insight\n\n# between\nstatus: open",
+    "trailing_spaces": "type: insight   \nstatus: open ",
+}
+
+# Frontmatter the scanner must hand to the YAML parser
+FALLBACK = {
+    "nested_mapping": "meta:\n  score: 0.5\n  tags: [a]",
+    "block_scalar": "summary: |\n  A multi-line\n  summary.",
+    "folded_scalar": "summary: >\n  folded\n  text",
+    "anchor_and_alias": "a: &x 1\nb: *x",
+    "tag": "a: !!str 1",
+    "flow_mapping": "m: {a: 1}",
+    "integer_key": "1: one",
+    "bool_key": "yes: value",
+    "null_key": "null: value",
+    "octal": "n: 012",
+    "yaml11_octal": "n: 0o17",
+    "sexagesimal": "t: 1:30",
+    "exponent": "v: 1e3",
+    "leading_dot_float": "x: .5",
+    "timestamp": "ts: 2025-01-03 10:00:00",
+    "escape_in_double_quotes": 'a: "line\\nbreak"',
+    "tab": "a:\tb",
+    "nested_flow_list": "x: [[a]]",
+    "colon_in_value": "a: b: c",
+    "inline_comment": "a: b # comment",
+    "trailing_colon": "a: b:",
+    "unterminated_quote": "a: \"open",
+    "nested_block_list": "a:\n  - - b",
+    "mapping_in_block_list": "a:\n  - b: c",
+    "inconsistent_list_indent": "a:\n  - b\n    - c",
+}
+
+
+def note(block: str) -> str:
+    return f"---\n{block}\n---\n\n# Title\n\nBody text.\n"
+
+
+def outcome(parse, text: str):
+    """Result of parsing text, with types spelled out, or the error raised."""
+    try:
+        metadata, content = parse(text)
+    except Exception as e:
+        return "error", type(e).__name__
+    return repr(metadata), content
+
+
+def frontmatter_loads(text: str):
+    post = frontmatter.loads(text)
+    return dict(post.metadata), post.content
+
+
+@pytest.mark.parametrize("block", FAST.values(), ids=FAST.keys())
+def test_fast_path_matches_python_frontmatter(block):
+    assert _parse_simple_frontmatter(block) is not None
+    text = note(block)
+    assert outcome(parse_frontmatter, text) == outcome(frontmatter_loads, text)
+
+
+@pytest.mark.parametrize("block", FALLBACK.values(), ids=FALLBACK.keys())
+def test_fallback_matches_python_frontmatter(block):
+    assert _parse_simple_frontmatter(block) is None
+    text = note(block)
+    assert outcome(parse_frontmatter, text) == outcome(frontmatter_loads, text)
+
+
+@pytest.mark.parametrize("block", FAST.values(), ids=FAST.keys())
+def test_crlf_matches_python_frontmatter(block):
+    text = note(block).replace("\n", "\r\n")
+    assert outcome(parse_frontmatter, text) == outcome(frontmatter_loads, text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "No frontmatter at all.\n",
+    "---\n---\nEmpty frontmatter.\n",
+    "---\ntype: insight\nUnclosed frontmatter.\n",
+    "\n\n---\ntype: insight\n---\nLeading blank lines.\n",
+    "---\ntype: insight\n---\nA rule\n\n---\n\nin the body.\n",
+    "---- \ntype: insight\n-----\nLong boundaries.\n",
+    "---\n- a\n- b\n---\nA list, not a mapping.\n",
+    "---\njust text\n---\nA scalar, not a mapping.\n",
+    "---\ninvalid date: 2025-02-30\n---\nbody\n",
+    "---\ncreated: 2025-02-30\n---\nbody\n",
+])
+def test_document_shapes_match_python_frontmatter(text):
+    assert outcome(parse_frontmatter, text) == outcome(frontmatter_loads, text)
@@ -0,0 +1,171 @@
+"""Tests for rate limiting and retries of OpenAI embedding requests."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import openai
+import pytest
+from openai import AsyncOpenAI
+
+from src.services.embedding_backends import OpenAIEmbeddingBackend
+from src.services.rate_limiter import RateLimiter
+
+
+class WordEncoding:
+    """One token per word, so tests need no tiktoken download."""
+
+    def encode_batch(self, texts, disallowed_special=()):
+        return [[1] * len(text.split()) for text in texts]
+
+
+def embeddings_response(request: httpx.Request) -> httpx.Response:
+    inputs = json.loads(request.content)["input"]
+    return httpx.Response(200, json={
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": i, "embedding": [float(len(tokens)), 1.0]}
+            for i, tokens in enumerate(inputs)
+        ],
+        "model": "text-embedding-3-small",
+        "usage": {"prompt_tokens": 1, "total_tokens": 1},
+    })
+
+
+class FakeAPI:
+    """Serve queued error responses, then embeddings, recording request times."""
+
+    def __init__(self, *errors: httpx.Response):
+        self.errors = list(errors)
+        self.request_times = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.request_times.append(time.monotonic())
+        if self.errors:
+            return self.errors.pop(0)
+        return embeddings_response(request)
+
+
+def make_backend(api: FakeAPI, rate_limiter: RateLimiter) -> OpenAIEmbeddingBackend:
+    backend = OpenAIEmbeddingBackend(api_key="test", rate_limiter=rate_limiter)
+    backend.client = AsyncOpenAI(
+        api_key="test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api)),
+    )
+    backend._encoding = WordEncoding()
+    return backend
+
+
+def error(status: int, headers=None) -> httpx.Response:
+    return httpx.Response(status, headers=headers, json={"error": {"message": "test"}})
+
+
+def test_rate_limited_request_waits_for_retry_after():
+    api = FakeAPI(error(429, {"retry-after": "0.2"}))
+    limiter = RateLimiter(base_delay=5.0)
+    backend = make_backend(api, limiter)
+
+    embeddings = asyncio.run(backend.embed_texts(["one two", "three"]))
+
+    assert embeddings == [[2.0, 1.0], [1.0, 1.0]]
+    assert len(api.request_times) == 2
+    # The hint is used instead of the (much longer) backoff
+    assert 0.2 <= api.request_times[1] - api.request_times[0] < 2.0
+    assert limiter.stats()["rate_limited"] == 1
+    assert limiter.stats()["retries"] == 1
+
+
+def test_rate_limit_pauses_other_callers():
+    api = FakeAPI(error(429, {"retry-after": "0.3"}))
+    limiter = RateLimiter()
+    backend = make_backend(api, limiter)
+
+    async def run():
+        first = asyncio.create_task(backend.embed_texts(["a"]))
+        await asyncio.sleep(0.05)
+        # Sent after the 429, so it must wait out the pause as well
+        second = asyncio.create_task(backend.embed_texts(["b"]))
+        await asyncio.gather(first, second)
+
+    started = time.monotonic()
+    asyncio.run(run())
+
+    assert len(api.request_times) == 3
+    assert min(api.request_times[1:]) - started >= 0.3
+
+
+def test_server_error_is_retried_until_success():
+    api = FakeAPI(error(500), error(503))
+    limiter = RateLimiter(base_delay=0.01)
+    backend = make_backend(api, limiter)
+
+    embeddings = asyncio.run(backend.embed_texts(["hello world"]))
+
+    assert embeddings == [[2.0, 1.0]]
+    assert len(api.request_times) == 3
+    stats = limiter.stats()
+    assert stats["retries"] == 2
+    assert stats["rate_limited"] == 0
+    assert stats["failures"] == 0
+
+
+def test_gives_up_after_max_retries():
+    api = FakeAPI(*(error(500) for _ in range(10)))
+    limiter = RateLimiter(max_retries=2, base_delay=0.01)
+    backend = make_backend(api, limiter)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(backend.embed_texts(["hello"]))
+
+    assert len(api.request_times) == 3
+    assert limiter.stats()["failures"] == 1
+
+
+def test_client_error_is_not_retried():
+    api = FakeAPI(error(400))
+    limiter = RateLimiter(base_delay=0.01)
+    backend = make_backend(api, limiter)
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(backend.embed_texts(["hello"]))
+
+    assert len(api.request_times) == 1
+    assert limiter.stats()["retries"] == 0
+
+
+def test_waits_for_request_budget():
+    api = FakeAPI()
+    # 10 requests per second once the burst is used up
+    limiter = RateLimiter(requests_per_minute=600)
+    backend = make_backend(api, limiter)
+
+    async def run():
+        await limiter.requests.acquire(600)
+        started = time.monotonic()
+        await backend.embed_texts(["hello"])
+        return started
+
+    started = asyncio.run(run())
+
+    assert api.request_times[0] - started >= 0.09
+    assert limiter.stats()["throttled_seconds"] >= 0.09
+
+
+def test_waits_for_token_budget():
+    api = FakeAPI()
+    # 100 tokens per second once the burst is used up
+    limiter = RateLimiter(tokens_per_minute=6000)
+    backend = make_backend(api, limiter)
+
+    async def run():
+        await limiter.tokens.acquire(6000)
+        started = time.monotonic()
+        await backend.embed_texts([" ".join(["word"] * 20)])
+        return started
+
+    started = asyncio.run(run())
+
+    # 20 tokens take 0.2s to refill
+    assert api.request_times[0] - started >= 0.19